@@ -24,6 +24,11 @@ class DatabaseConfig(BaseModel):
     neo4j_uri: str = Field(default_factory=lambda: os.getenv("NEO4J_URI"))
     neo4j_user: str = Field(default_factory=lambda: os.getenv("NEO4J_USER"))
     neo4j_password: str = Field(default_factory=lambda: os.getenv("NEO4J_PASSWORD"))
+    neo4j_database: str = Field(default_factory=lambda: os.getenv("NEO4J_DATABASE", "neo4j"))
+    neo4j_max_pool_size: int = Field(default_factory=lambda: int(os.getenv("NEO4J_MAX_POOL_SIZE", 100)))
+    neo4j_acquisition_timeout: float = Field(default_factory=lambda: float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", 60.0)))
+    neo4j_connection_timeout: float = Field(default_factory=lambda: float(os.getenv("NEO4J_CONNECTION_TIMEOUT", 5.0)))
+    postgresql_pool_size: int = Field(default_factory=lambda: int(os.getenv("DATABASE_POOL_SIZE", 7)))
 
 class ProcessingConfig(BaseModel):
     """Processing configuration"""
@@ -31,6 +36,16 @@ class ProcessingConfig(BaseModel):
     max_concurrent: int = Field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_REQUESTS", 5)))
     max_daily_cost: float = Field(default_factory=lambda: float(os.getenv("MAX_DAILY_COST", 200.0)))
     cost_alert_threshold: float = Field(default_factory=lambda: float(os.getenv("COST_ALERT_THRESHOLD", 150.0)))
+    llm_cache_path: str = Field(default_factory=lambda: os.getenv("LLM_CACHE_PATH", "cache/llm_responses.sqlite"))
+    # Also cache sampled (temperature > 0) responses, so development reruns replay them; off unless KG_LLM_CACHE=1
+    llm_cache_all: bool = Field(default_factory=lambda: os.getenv("KG_LLM_CACHE") == "1")
+    batch_poll_interval: float = Field(default_factory=lambda: float(os.getenv("BATCH_POLL_INTERVAL", 30.0)))
+    copy_spool_max_bytes: int = Field(default_factory=lambda: int(os.getenv("COPY_SPOOL_MAX_BYTES", 64 * 1024 * 1024)))
+    # Empty disables the extraction cache; bump the schema version when the curriculum schema changes
+    extraction_cache_dir: str = Field(default_factory=lambda: os.getenv("EXTRACTION_CACHE_DIR", ""))
+    extraction_schema_version: str = Field(default_factory=lambda: os.getenv("EXTRACTION_SCHEMA_VERSION", "1"))
+    # Write raw design responses to debug/ for inspection; off unless KG_DEBUG_DUMP=1
+    debug_dump: bool = Field(default_factory=lambda: os.getenv("KG_DEBUG_DUMP") == "1")
 
 class Config:
     """Main configuration class"""
@@ -5,10 +5,10 @@ Export all phase results to Neo4j graph database
 import json
 import sys
 from pathlib import Path
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 from src.neo4j_manager import Neo4jManager
 from src.data_manager import DatabaseManager
+from src.artifacts import load_artifact
 from loguru import logger
 
 def load_all_results():
@@ -19,24 +19,21 @@ def load_all_results():
     
     # Load Phase 1 results
     try:
-        with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-            all_results['foundation_design'] = json.load(f)
+        all_results['foundation_design'] = load_artifact('output/phase1_foundation_design.json')
         logger.info("✅ Loaded Phase 1 foundation design")
     except Exception as e:
         logger.warning(f"Could not load Phase 1: {e}")
     
     # Load Phase 2 results
     try:
-        with open('output/phase2_relationship_extraction.json', 'r', encoding='utf-8') as f:
-            all_results['relationship_data'] = json.load(f)
+        all_results['relationship_data'] = load_artifact('output/phase2_relationship_extraction.json')
         logger.info("✅ Loaded Phase 2 relationship extraction")
     except Exception as e:
         logger.warning(f"Could not load Phase 2: {e}")
     
     # Load Phase 3 results
     try:
-        with open('output/phase3_refinement_results.json', 'r', encoding='utf-8') as f:
-            all_results['refinement_results'] = json.load(f)
+        all_results['refinement_results'] = load_artifact('output/phase3_refinement_results.json')
         logger.info("✅ Loaded Phase 3 refinement results")
     except Exception as e:
         logger.warning(f"Could not load Phase 3: {e}")
@@ -51,8 +48,8 @@ def load_all_results():
     
     # Load curriculum data from database
     try:
-        db_manager = DatabaseManager()
-        all_results['curriculum_data'] = db_manager.extract_all_curriculum_data()
+        with DatabaseManager() as db_manager:
+            all_results['curriculum_data'] = db_manager.extract_all_curriculum_data()
         logger.info(f"✅ Loaded curriculum data from database")
         logger.info(f"   - Achievement standards: {len(all_results['curriculum_data'].get('achievement_standards', []))}")
         logger.info(f"   - Achievement levels: {len(all_results['curriculum_data'].get('achievement_levels', []))}")
@@ -16,6 +16,8 @@ from src.phase3_refinement import run_phase3
 from src.phase4_validation import run_phase4
 from src.neo4j_manager import Neo4jManager
 from src.ai_models import AIModelManager
+from src.artifacts import load_artifact
+from src.runtime import install_event_loop
 
 class KnowledgeGraphOrchestrator:
     """Main orchestrator for the knowledge graph construction project"""
@@ -34,7 +36,8 @@ class KnowledgeGraphOrchestrator:
             rotation="1 day",
             retention="30 days",
             level="INFO",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
+            format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}",
+            enqueue=True
         )
         
     async def run_complete_pipeline(self, resume_from_phase: int = 1) -> Dict[str, Any]:
@@ -141,8 +144,7 @@ class KnowledgeGraphOrchestrator:
         try:
             # Load previous results if needed
             if 'foundation_design' not in self.results:
-                with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-                    self.results['foundation_design'] = json.load(f)
+                self.results['foundation_design'] = load_artifact('output/phase1_foundation_design.json')
             
             if 'curriculum_data' not in self.results:
                 self.results['curriculum_data'] = self.db_manager.extract_all_curriculum_data()
@@ -167,12 +169,10 @@ class KnowledgeGraphOrchestrator:
         try:
             # Load previous results if needed
             if 'relationship_data' not in self.results:
-                with open('output/phase2_relationship_extraction.json', 'r', encoding='utf-8') as f:
-                    self.results['relationship_data'] = json.load(f)
+                self.results['relationship_data'] = load_artifact('output/phase2_relationship_extraction.json')
             
             if 'foundation_design' not in self.results:
-                with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-                    self.results['foundation_design'] = json.load(f)
+                self.results['foundation_design'] = load_artifact('output/phase1_foundation_design.json')
             
             # Run Phase 3
             refinement_results = await run_phase3(
@@ -210,8 +210,7 @@ class KnowledgeGraphOrchestrator:
                     
                     file_path = file_mapping.get(key)
                     if file_path and os.path.exists(file_path):
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            all_previous_results[key] = json.load(f)
+                        all_previous_results[key] = load_artifact(file_path)
             
             # Run Phase 4
             validation_results = await run_phase4(all_previous_results)
@@ -421,28 +420,33 @@ async def main():
     
     orchestrator = KnowledgeGraphOrchestrator()
     
-    if args.phase_only is not None:
-        # Run specific phase only
-        logger.info(f"Running Phase {args.phase_only} only")
+    try:
+        if args.phase_only is not None:
+            # Run specific phase only
+            logger.info(f"Running Phase {args.phase_only} only")
         
-        if args.phase_only == 1:
-            await orchestrator._run_phase1()
-        elif args.phase_only == 2:
-            await orchestrator._run_phase2()
-        elif args.phase_only == 3:
-            await orchestrator._run_phase3()
-        elif args.phase_only == 4:
-            await orchestrator._run_phase4()
-        elif args.phase_only == 5:
-            await orchestrator._create_neo4j_graph()
+            if args.phase_only == 1:
+                await orchestrator._run_phase1()
+            elif args.phase_only == 2:
+                await orchestrator._run_phase2()
+            elif args.phase_only == 3:
+                await orchestrator._run_phase3()
+            elif args.phase_only == 4:
+                await orchestrator._run_phase4()
+            elif args.phase_only == 5:
+                await orchestrator._create_neo4j_graph()
+            else:
+                logger.error("Invalid phase number")
         else:
-            logger.error("Invalid phase number")
-    else:
-        # Run complete pipeline
-        result = await orchestrator.run_complete_pipeline(args.resume_from)
-        print(f"Pipeline result: {result['status']}")
-        if result['status'] == 'success':
-            print(f"Results saved to: {result.get('final_report_path')}")
+            # Run complete pipeline
+            result = await orchestrator.run_complete_pipeline(args.resume_from)
+            print(f"Pipeline result: {result['status']}")
+            if result['status'] == 'success':
+                print(f"Results saved to: {result.get('final_report_path')}")
+    finally:
+        orchestrator.db_manager.close()
+        await orchestrator.ai_manager.aclose()
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(main())
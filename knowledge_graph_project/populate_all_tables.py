@@ -4,6 +4,7 @@
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import json
 from loguru import logger
 import random
@@ -52,12 +53,12 @@ class CompleteTablePopulator:
                     ))
         
         if mappings:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.standard_terms 
                 (standard_id, term_id, relation_type, method, confidence, evidence_text)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (standard_id, term_id) DO NOTHING
-            """, mappings)
+            """, mappings, page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(mappings)} term mappings")
             
@@ -97,12 +98,12 @@ class CompleteTablePopulator:
                     ))
         
         if mappings:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.standard_competencies 
                 (standard_id, comp_id, weight, method, confidence, evidence_text)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (standard_id, comp_id) DO NOTHING
-            """, mappings)
+            """, mappings, page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(mappings)} competency mappings")
             
@@ -161,12 +162,12 @@ class CompleteTablePopulator:
                     ))
         
         if mappings:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.standard_representations 
                 (standard_id, rep_type_id, representation_text, media_uri, method, confidence, evidence_text)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT DO NOTHING
-            """, mappings)
+            """, mappings, page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(mappings)} representation mappings")
             
@@ -213,12 +214,12 @@ class CompleteTablePopulator:
                 element_counter += 1
         
         if elements:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.learning_elements 
                 (domain_id, level_id, category_id, element_name, element_description, element_order)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT DO NOTHING
-            """, elements)
+            """, elements, page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(elements)} learning elements")
             
@@ -262,12 +263,12 @@ class CompleteTablePopulator:
                 ))
         
         if mappings:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.standard_contexts 
                 (standard_id, context_id, method, confidence, evidence_text)
-                VALUES (%s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT DO NOTHING
-            """, [(m[0], m[1], 'rule', m[2], m[3]) for m in mappings])
+            """, [(m[0], m[1], 'rule', m[2], m[3]) for m in mappings], page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(mappings)} context mappings")
             
@@ -312,12 +313,12 @@ class CompleteTablePopulator:
             ))
         
         if domain_levels:
-            self.cursor.executemany("""
+            execute_values(self.cursor, """
                 INSERT INTO curriculum.domain_achievement_levels 
                 (level_id, domain_id, level_code, category_id, level_description)
-                VALUES (%s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT DO NOTHING
-            """, domain_levels)
+            """, domain_levels, page_size=1000)
             self.conn.commit()
             logger.info(f"✅ Inserted {len(domain_levels)} domain achievement levels")
             
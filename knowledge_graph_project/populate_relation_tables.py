@@ -6,6 +6,7 @@ Neo4j 그래프 데이터와 AI 분석 결과를 활용하여 비어있는 연
 
 import json
 import psycopg2
+from psycopg2.extras import execute_values
 from neo4j import GraphDatabase
 import pandas as pd
 import re
@@ -98,14 +99,17 @@ class RelationTablePopulator:
         
         # PostgreSQL에 삽입
         if relations:
-            self.pg_cursor.executemany("""
+            # RELATED_TO/SIMILAR_TO가 같은 HORIZONTAL 키로 겹칠 수 있어 키별 마지막 행만 남김
+            # (한 INSERT 문 안에서 같은 행을 두 번 DO UPDATE 할 수 없음)
+            relations = list({relation[:3]: relation for relation in relations}.values())
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.achievement_standard_relations 
                 (src_standard_id, dst_standard_id, relation_type, rationale, method, confidence)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (src_standard_id, dst_standard_id, relation_type) DO UPDATE
                 SET confidence = EXCLUDED.confidence,
                     rationale = EXCLUDED.rationale
-            """, relations)
+            """, relations, page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Inserted {len(relations)} relations")
         
@@ -147,14 +151,14 @@ class RelationTablePopulator:
         
         # PostgreSQL에 삽입
         if mappings:
-            self.pg_cursor.executemany("""
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.standard_terms 
                 (standard_id, term_id, relation_type, method, confidence, evidence_text)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (standard_id, term_id) DO UPDATE
                 SET confidence = EXCLUDED.confidence,
                     evidence_text = EXCLUDED.evidence_text
-            """, mappings)
+            """, mappings, page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Created {len(mappings)} term mappings")
             
@@ -198,13 +202,13 @@ class RelationTablePopulator:
         
         # PostgreSQL에 삽입
         if competency_mappings:
-            self.pg_cursor.executemany("""
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.standard_competencies 
                 (standard_code, competency_id, relevance_level, notes)
-                VALUES (%s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (standard_code, competency_id) DO UPDATE
                 SET relevance_level = EXCLUDED.relevance_level
-            """, competency_mappings)
+            """, competency_mappings, page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Created {len(competency_mappings)} competency mappings")
             
@@ -248,13 +252,13 @@ class RelationTablePopulator:
                     ))
         
         if representation_mappings:
-            self.pg_cursor.executemany("""
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.standard_representations 
                 (standard_code, representation_id, is_primary, notes)
-                VALUES (%s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (standard_code, representation_id) DO UPDATE
                 SET is_primary = EXCLUDED.is_primary
-            """, representation_mappings)
+            """, representation_mappings, page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Created {len(representation_mappings)} representation mappings")
             
@@ -303,13 +307,14 @@ class RelationTablePopulator:
                 ))
         
         if learning_elements:
-            self.pg_cursor.executemany("""
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.learning_elements 
                 (element_name, element_type, description, standard_code, sequence_order, metadata)
-                VALUES (%s, %s, %s, %s, %s, %s::jsonb)
+                VALUES %s
                 ON CONFLICT (element_name) DO UPDATE
                 SET description = EXCLUDED.description
-            """, learning_elements)
+            """, learning_elements,
+                template="(%s, %s, %s, %s, %s, %s::jsonb)", page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Created {len(learning_elements)} learning elements")
             
@@ -359,13 +364,14 @@ class RelationTablePopulator:
             ))
         
         if domain_levels:
-            self.pg_cursor.executemany("""
+            execute_values(self.pg_cursor, """
                 INSERT INTO curriculum.domain_achievement_levels 
                 (level_id, domain, level_name, description, metadata)
-                VALUES (%s, %s, %s, %s, %s::jsonb)
+                VALUES %s
                 ON CONFLICT (level_id) DO UPDATE
                 SET description = EXCLUDED.description
-            """, domain_levels)
+            """, domain_levels,
+                template="(%s, %s, %s, %s, %s::jsonb)", page_size=1000)
             self.pg_conn.commit()
             logger.info(f"✅ Created {len(domain_levels)} domain achievement levels")
             
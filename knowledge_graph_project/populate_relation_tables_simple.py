@@ -4,6 +4,7 @@
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 from neo4j import GraphDatabase
 from loguru import logger
 
@@ -69,13 +70,16 @@ def populate_achievement_standard_relations():
         
         # PostgreSQL에 삽입
         if relations:
-            pg_cursor.executemany("""
+            # RELATED_TO/SIMILAR_TO가 같은 HORIZONTAL 키로 겹칠 수 있어 키별 마지막 행만 남김
+            # (한 INSERT 문 안에서 같은 행을 두 번 DO UPDATE 할 수 없음)
+            relations = list({relation[:3]: relation for relation in relations}.values())
+            execute_values(pg_cursor, """
                 INSERT INTO curriculum.achievement_standard_relations 
                 (src_standard_id, dst_standard_id, relation_type, rationale, method, confidence)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (src_standard_id, dst_standard_id, relation_type) DO UPDATE
                 SET confidence = EXCLUDED.confidence
-            """, relations)
+            """, relations, page_size=1000)
             pg_conn.commit()
             logger.info(f"✅ Inserted {len(relations)} relations")
             
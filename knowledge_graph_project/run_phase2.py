@@ -3,13 +3,14 @@
 Execute Phase 2: Relationship Extraction
 """
 import asyncio
-import json
 import sys
+from itertools import islice
 from pathlib import Path
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 from src.phase2_relationships import run_phase2
 from src.data_manager import DatabaseManager
+from src.artifacts import load_cached
+from src.runtime import configure_logging, install_event_loop
 from loguru import logger
 
 async def execute_phase2():
@@ -22,19 +23,21 @@ async def execute_phase2():
     try:
         # Load Phase 1 output
         logger.info("Loading Phase 1 foundation design...")
-        with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-            foundation_design = json.load(f)
+        foundation_design = load_cached('output/phase1_foundation_design.json')
         
+        node_schema = foundation_design.get('node_structure', {}).get('knowledge_graph_schema', {})
+        hierarchy = foundation_design.get('hierarchical_structure', {}).get('knowledgeGraph', {})
+        clusters = foundation_design.get('community_clusters', {})
         logger.info(f"✅ Loaded foundation design with {len(foundation_design)} components")
-        logger.info(f"   - Node types: {len(foundation_design.get('node_structure', {}).get('knowledge_graph_schema', {}).get('node_types', []))}")
+        logger.info(f"   - Node types: {len(node_schema.get('node_types', []))}")
         logger.info(f"   - Relationship categories: {len(foundation_design.get('relationship_categories', {}))}")
-        logger.info(f"   - Hierarchy levels: {len(foundation_design.get('hierarchical_structure', {}).get('knowledgeGraph', {}).get('hierarchicalStructure', []))}")
-        logger.info(f"   - Community clusters: {len(foundation_design.get('community_clusters', {}).get('knowledge_graph_clusters', []))}")
+        logger.info(f"   - Hierarchy levels: {len(hierarchy.get('hierarchicalStructure', []))}")
+        logger.info(f"   - Community clusters: {len(clusters.get('knowledge_graph_clusters', []))}")
         
         # Load curriculum data from database
         logger.info("\nLoading curriculum data from database...")
-        db_manager = DatabaseManager()
-        curriculum_data = db_manager.extract_all_curriculum_data()
+        with DatabaseManager() as db_manager:
+            curriculum_data = db_manager.extract_all_curriculum_data()
         
         logger.info(f"✅ Loaded curriculum data:")
         logger.info(f"   - Achievement standards: {len(curriculum_data.get('achievement_standards', []))}")
@@ -90,7 +93,7 @@ async def execute_phase2():
             if weighted_relations:
                 # Sample first few relations
                 logger.info("\nSample relationships (first 5):")
-                for i, rel in enumerate(weighted_relations[:5], 1):
+                for i, rel in enumerate(islice(weighted_relations, 5), 1):
                     logger.info(f"   {i}. {rel.get('source_code')} → {rel.get('target_code')}")
                     logger.info(f"      Type: {rel.get('relation_type')}, Weight: {rel.get('weight')}")
                     logger.info(f"      Validated: {rel.get('validated', False)}, Mapped: {rel.get('mapped_type', 'N/A')}")
@@ -129,14 +132,15 @@ async def execute_phase2():
         return False
         
     except Exception as e:
-        logger.error(f"❌ Phase 2 execution failed with error: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"❌ Phase 2 execution failed with error: {e}")
         return False
 
 def main():
     """Main execution function"""
     
+    configure_logging()
+    install_event_loop()
+    
     print("\n" + "="*60)
     print("PHASE 2: RELATIONSHIP EXTRACTION")
     print("="*60)
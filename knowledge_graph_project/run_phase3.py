@@ -3,12 +3,14 @@
 Execute Phase 3: Advanced Refinement
 """
 import asyncio
-import json
+import gc
 import sys
+from itertools import islice
 from pathlib import Path
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 from src.phase3_refinement import run_phase3
+from src.artifacts import load_artifact, load_cached
+from src.runtime import configure_logging, install_event_loop
 from loguru import logger
 
 async def execute_phase3():
@@ -21,20 +23,19 @@ async def execute_phase3():
     try:
         # Load Phase 1 output (foundation design)
         logger.info("Loading Phase 1 foundation design...")
-        with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-            foundation_design = json.load(f)
+        foundation_design = load_cached('output/phase1_foundation_design.json')
         
         logger.info(f"✅ Loaded foundation design with {len(foundation_design)} components")
         
         # Load Phase 2 output (relationship extraction)
         logger.info("\nLoading Phase 2 relationship extraction...")
-        with open('output/phase2_relationship_extraction.json', 'r', encoding='utf-8') as f:
-            relationship_data = json.load(f)
+        relationship_data = load_artifact('output/phase2_relationship_extraction.json')
         
+        relationship_metadata = relationship_data.get('metadata', {})
         logger.info(f"✅ Loaded relationship data:")
         logger.info(f"   - Total relations: {len(relationship_data.get('weighted_relations', []))}")
-        logger.info(f"   - Relation types: {relationship_data.get('metadata', {}).get('relation_types_count', 0)}")
-        logger.info(f"   - Foundation integrated: {relationship_data.get('metadata', {}).get('foundation_design_integrated', False)}")
+        logger.info(f"   - Relation types: {relationship_metadata.get('relation_types_count', 0)}")
+        logger.info(f"   - Foundation integrated: {relationship_metadata.get('foundation_design_integrated', False)}")
         
         # Run Phase 3
         logger.info("\n" + "=" * 60)
@@ -43,6 +44,10 @@ async def execute_phase3():
         
         refinement_results = await run_phase3(relationship_data, foundation_design)
         
+        # Release phase 1-2 inputs before the reporting below
+        del foundation_design, relationship_data
+        gc.collect()
+        
         # Check results
         logger.info("\n" + "=" * 60)
         logger.info("Phase 3 Execution Results:")
@@ -101,7 +106,7 @@ async def execute_phase3():
             # Sample refined relations
             if final_relations:
                 logger.info("\nSample refined relationships (first 5):")
-                for i, rel in enumerate(final_relations[:5], 1):
+                for i, rel in enumerate(islice(final_relations, 5), 1):
                     logger.info(f"   {i}. {rel.get('source_code')} → {rel.get('target_code')}")
                     logger.info(f"      Type: {rel.get('refined_type', rel.get('relation_type'))}")
                     logger.info(f"      Weight: {rel.get('weight', 'N/A')}")
@@ -126,14 +131,15 @@ async def execute_phase3():
         return False
         
     except Exception as e:
-        logger.error(f"❌ Phase 3 execution failed with error: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"❌ Phase 3 execution failed with error: {e}")
         return False
 
 def main():
     """Main execution function"""
     
+    configure_logging()
+    install_event_loop()
+    
     print("\n" + "="*60)
     print("PHASE 3: ADVANCED REFINEMENT")
     print("="*60)
@@ -3,12 +3,14 @@
 Execute Phase 4: Validation and Optimization
 """
 import asyncio
-import json
+import gc
 import sys
+from itertools import islice
 from pathlib import Path
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 from src.phase4_validation import run_phase4
+from src.artifacts import load_artifact, load_cached
+from src.runtime import configure_logging, install_event_loop
 from loguru import logger
 
 async def execute_phase4():
@@ -21,22 +23,19 @@ async def execute_phase4():
     try:
         # Load Phase 1 output (foundation design)
         logger.info("Loading Phase 1 foundation design...")
-        with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-            foundation_design = json.load(f)
+        foundation_design = load_cached('output/phase1_foundation_design.json')
         
         logger.info(f"✅ Loaded foundation design with {len(foundation_design)} components")
         
         # Load Phase 2 output (relationship extraction)
         logger.info("\nLoading Phase 2 relationship extraction...")
-        with open('output/phase2_relationship_extraction.json', 'r', encoding='utf-8') as f:
-            relationship_data = json.load(f)
+        relationship_data = load_artifact('output/phase2_relationship_extraction.json')
         
         logger.info(f"✅ Loaded relationship data with {len(relationship_data.get('weighted_relations', []))} relations")
         
         # Load Phase 3 output (refinement results)
         logger.info("\nLoading Phase 3 refinement results...")
-        with open('output/phase3_refinement_results.json', 'r', encoding='utf-8') as f:
-            refinement_results = json.load(f)
+        refinement_results = load_artifact('output/phase3_refinement_results.json')
         
         logger.info(f"✅ Loaded refinement results:")
         logger.info(f"   - Final relations: {len(refinement_results.get('final_relations', []))}")
@@ -56,6 +55,11 @@ async def execute_phase4():
         
         validation_results = await run_phase4(all_results)
         
+        # Release phase 1-3 inputs before the reporting below
+        all_results.clear()
+        del foundation_design, relationship_data, refinement_results
+        gc.collect()
+        
         # Check results
         logger.info("\n" + "=" * 60)
         logger.info("Phase 4 Execution Results:")
@@ -106,7 +110,7 @@ async def execute_phase4():
                 rec_items = recommendations.get('recommendations', []) if isinstance(recommendations, dict) else recommendations
                 if rec_items:
                     logger.info(f"\n📋 Optimization Recommendations ({len(rec_items)} items):")
-                    for i, rec in enumerate(rec_items[:5] if isinstance(rec_items, list) else list(rec_items.items())[:5], 1):
+                    for i, rec in enumerate(islice(rec_items if isinstance(rec_items, list) else rec_items.items(), 5), 1):
                         if isinstance(rec, dict):
                             logger.info(f"   {i}. {rec.get('category', 'General')}: {rec.get('recommendation', '')[:80]}...")
                         elif isinstance(rec, tuple):
@@ -140,14 +144,15 @@ async def execute_phase4():
         return False
         
     except Exception as e:
-        logger.error(f"❌ Phase 4 execution failed with error: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"❌ Phase 4 execution failed with error: {e}")
         return False
 
 def main():
     """Main execution function"""
     
+    configure_logging()
+    install_event_loop()
+    
     print("\n" + "="*60)
     print("PHASE 4: VALIDATION AND OPTIMIZATION")
     print("="*60)
@@ -2,19 +2,85 @@
 AI Model interfaces for different providers
 """
 import asyncio
-import json
-from typing import List, Dict, Any, Optional
+import io
+import random
+from collections import Counter
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable
 from abc import ABC, abstractmethod
 import openai
 import anthropic
 import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential
+import orjson
+from google.api_core import exceptions as google_exceptions
 from loguru import logger
 from config.settings import config
+from src.llm_cache import LLMCache
+
+# Request options that make an otherwise deterministic call non-reproducible
+NONDETERMINISTIC_KWARGS = ('n', 'stream', 'seed')
+
+# Batch APIs (OpenAI Batch, Anthropic Message Batches) bill at half the live rate
+BATCH_COST_FACTOR = 0.5
+
+# Shared OpenAI system message; the SDK only serializes it, so one dict serves every call
+OPENAI_SYSTEM_PROMPT = "You are a Korean mathematics curriculum expert."
+OPENAI_SYSTEM_MESSAGE = {"role": "system", "content": OPENAI_SYSTEM_PROMPT}
+
+# Request options the OpenAI chat API rejects; GPT-5 additionally has a fixed temperature
+OPENAI_UNSUPPORTED_KWARGS = frozenset({'reasoning_effort', 'verbosity', 'thinking_budget'})
+GPT5_UNSUPPORTED_KWARGS = OPENAI_UNSUPPORTED_KWARGS | {'temperature'}
+
+# Transient provider errors worth retrying; other 4xx responses fail immediately
+OPENAI_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+ANTHROPIC_RETRYABLE_ERRORS = (anthropic.RateLimitError, anthropic.APIConnectionError, anthropic.InternalServerError)
+GEMINI_RETRYABLE_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable,
+                           google_exceptions.InternalServerError, google_exceptions.DeadlineExceeded)
+
+# Retry policy: attempts per call, first backoff and the cap (seconds) for any single
+# backoff or server-hinted Retry-After wait
+RETRY_MAX_ATTEMPTS = 5
+RETRY_INITIAL_WAIT = 2.0
+RETRY_MAX_WAIT = 30.0
+
+class CostLimitExceeded(Exception):
+    """Raised when spend, including calls still in flight, reaches the daily cost limit"""
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Wait as long as the server's Retry-After header asks, else back off exponentially with jitter"""
+    response = getattr(error, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('retry-after')
+    try:
+        return min(float(retry_after), RETRY_MAX_WAIT)
+    except (TypeError, ValueError):
+        return min(RETRY_INITIAL_WAIT * 2 ** (attempt - 1) + random.uniform(0, 1), RETRY_MAX_WAIT)
+
+# Keep-alive HTTP/2 pools shared by every interface of the same provider SDK
+_SDK_HTTP_CLIENT_FACTORIES = {
+    'openai': openai.DefaultAsyncHttpxClient,
+    'anthropic': anthropic.DefaultAsyncHttpxClient
+}
+_shared_http_clients: Dict[str, Any] = {}
+
+def get_shared_http_client(provider: str):
+    """Return the pooled HTTP client for a provider SDK, creating it on first use"""
+    client = _shared_http_clients.get(provider)
+    if client is None or client.is_closed:
+        client = _SDK_HTTP_CLIENT_FACTORIES[provider](http2=True)
+        _shared_http_clients[provider] = client
+    return client
+
+async def close_shared_http_clients():
+    """Close the pooled HTTP clients; later SDK clients get fresh pools"""
+    for client in _shared_http_clients.values():
+        await client.aclose()
+    _shared_http_clients.clear()
 
 class AIModelInterface(ABC):
     """Abstract base class for AI model interfaces"""
     
+    # Transient errors _call_with_retry retries; anything else is raised at once
+    retryable_errors: tuple = ()
+    
     def __init__(self, model_config):
         self.config = model_config
         self.total_cost = 0.0
@@ -25,10 +91,28 @@ class AIModelInterface(ABC):
         """Generate completion from the model"""
         pass
     
-    def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+    async def _call_with_retry(self, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Await call(), retrying transient provider errors"""
+        for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
+            try:
+                return await call()
+            except self.retryable_errors as e:
+                if attempt == RETRY_MAX_ATTEMPTS:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"Retrying {self.config.name} in {delay:.1f}s (attempt {attempt}): {e}")
+                await asyncio.sleep(delay)
+    
+    def estimate_cost(self, prompt: str, **kwargs) -> float:
+        """Upper bound on a call's cost: one token per prompt character and a full max_tokens reply"""
+        input_tokens = len(prompt) + len(kwargs.get('cached_prefix') or '')
+        output_tokens = kwargs.get('max_tokens', self.config.max_tokens)
+        return input_tokens * self.config.cost_per_input_token + output_tokens * self.config.cost_per_output_token
+    
+    def calculate_cost(self, input_tokens: int, output_tokens: int, cost_factor: float = 1.0) -> float:
         """Calculate cost based on token usage"""
         cost = (input_tokens * self.config.cost_per_input_token + 
-                output_tokens * self.config.cost_per_output_token)
+                output_tokens * self.config.cost_per_output_token) * cost_factor
         self.total_cost += cost
         self.token_usage['input'] += input_tokens
         self.token_usage['output'] += output_tokens
@@ -46,47 +130,66 @@ class AIModelInterface(ABC):
 class OpenAIInterface(AIModelInterface):
     """OpenAI GPT models interface"""
     
+    retryable_errors = OPENAI_RETRYABLE_ERRORS
+    
     def __init__(self, model_config):
         super().__init__(model_config)
-        self.client = openai.AsyncOpenAI(api_key=model_config.api_key)
+        self.client = openai.AsyncOpenAI(api_key=model_config.api_key, http_client=get_shared_http_client('openai'))
+        
+        # The model family is fixed per interface, so pick its parameter shape once
+        if 'gpt-5' in model_config.name.lower():
+            self._unsupported_kwargs = GPT5_UNSUPPORTED_KWARGS
+            self._build_params = self._gpt5_params
+        else:
+            self._unsupported_kwargs = OPENAI_UNSUPPORTED_KWARGS
+            self._build_params = self._default_params
+    
+    def _gpt5_params(self, messages: List[Dict[str, str]], max_tokens: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """GPT-5 uses max_completion_tokens instead of max_tokens and has no temperature"""
+        return {
+            "model": self.config.name,
+            "messages": messages,
+            "max_completion_tokens": max_tokens,
+            **kwargs
+        }
+    
+    def _default_params(self, messages: List[Dict[str, str]], max_tokens: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Parameters for the other chat models"""
+        return {
+            "model": self.config.name,
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+    
+    def _chat_params(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build chat.completions parameters for a prompt"""
+        # Extract max_tokens from kwargs if provided, otherwise use default
+        max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
+        cached_prefix = kwargs.pop('cached_prefix', None)
+        
+        # Remove parameters this model family does not support
+        kwargs = {key: value for key, value in kwargs.items() if key not in self._unsupported_kwargs}
+        
+        # Static context goes into the system message so every call shares the same
+        # prefix; OpenAI caches identical prompt prefixes automatically.
+        system_message = OPENAI_SYSTEM_MESSAGE
+        if cached_prefix:
+            system_message = {"role": "system", "content": f"{OPENAI_SYSTEM_PROMPT}\n\n{cached_prefix}"}
+        
+        messages = [system_message, {"role": "user", "content": prompt}]
+        
+        return self._build_params(messages, max_tokens, kwargs)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate completion using OpenAI API"""
+        return await self._call_with_retry(lambda: self._generate_completion(prompt, **kwargs))
+    
+    async def _generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Single OpenAI API request"""
         try:
-            # Extract max_tokens from kwargs if provided, otherwise use default
-            max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
-            
-            # Remove unsupported parameters for all OpenAI models
-            kwargs.pop('reasoning_effort', None)
-            kwargs.pop('verbosity', None)
-            kwargs.pop('thinking_budget', None)
-            
-            # For GPT-5, use max_completion_tokens only
-            if 'gpt-5' in self.config.name.lower():
-                # GPT-5 uses max_completion_tokens instead of max_tokens
-                kwargs.pop('temperature', None)  # GPT-5 doesn't support temperature
-                
-                response = await self.client.chat.completions.create(
-                    model=self.config.name,
-                    messages=[
-                        {"role": "system", "content": "You are a Korean mathematics curriculum expert."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_completion_tokens=max_tokens,  # GPT-5 uses this parameter
-                    **kwargs
-                )
-            else:
-                response = await self.client.chat.completions.create(
-                    model=self.config.name,
-                    messages=[
-                        {"role": "system", "content": "You are a Korean mathematics curriculum expert."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.config.temperature,
-                    max_tokens=max_tokens,  # Other models use this
-                    **kwargs
-                )
+            response = await self.client.chat.completions.create(**self._chat_params(prompt, **kwargs))
             
             # Calculate cost
             usage = response.usage
@@ -108,15 +211,60 @@ class OpenAIInterface(AIModelInterface):
             logger.error(f"OpenAI API error: {e}")
             raise
     
+    async def generate_completion_stream(self, prompt: str, final: Optional[Dict[str, Any]] = None,
+                                         **kwargs) -> AsyncIterator[str]:
+        """Stream completion text as it arrives; usage and cost are filled into `final` at the end"""
+        params = self._chat_params(prompt, **kwargs)
+        params['stream'] = True
+        # The terminal chunk carries usage (with empty choices) only when requested
+        params['stream_options'] = {"include_usage": True}
+        
+        parts = []
+        usage = None
+        finish_reason = None
+        try:
+            async for chunk in await self.client.chat.completions.create(**params):
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield choice.delta.content
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+        
+        input_tokens = usage.prompt_tokens if usage else 0
+        output_tokens = usage.completion_tokens if usage else 0
+        cost = self.calculate_cost(input_tokens, output_tokens)
+        if final is not None:
+            final.update({
+                'content': "".join(parts),
+                'model': self.config.name,
+                'cost': cost,
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'finish_reason': finish_reason
+            })
+        
+        logger.info(f"OpenAI stream - Cost: ${cost:.4f}, Tokens: {input_tokens}+{output_tokens}")
+    
     async def create_batch_job(self, requests: List[Dict]) -> str:
         """Create batch job for cost optimization"""
         try:
-            # Create JSONL file for batch
-            batch_input = "\n".join([json.dumps(req) for req in requests])
+            # Create JSONL file for batch, encoding each request straight into one buffer
+            batch_input = io.BytesIO()
+            for req in requests:
+                batch_input.write(orjson.dumps(req, option=orjson.OPT_APPEND_NEWLINE))
+            batch_input.seek(0)
             
             # Upload file
             file_response = await self.client.files.create(
-                file=batch_input.encode(),
+                file=("batch_input.jsonl", batch_input),
                 purpose="batch"
             )
             
@@ -133,70 +281,251 @@ class OpenAIInterface(AIModelInterface):
         except Exception as e:
             logger.error(f"Failed to create batch job: {e}")
             raise
+    
+    async def submit_batch(self, prompts: List[str], **kwargs) -> str:
+        """Submit prompts as one Batch API job, using the prompt index as custom_id"""
+        requests = [
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._chat_params(prompt, **kwargs)
+            }
+            for i, prompt in enumerate(prompts)
+        ]
+        return await self.create_batch_job(requests)
+    
+    async def poll_batch(self, batch_id: str, poll_interval: Optional[float] = None):
+        """Poll a batch job until it reaches a terminal status"""
+        poll_interval = poll_interval or config.processing.batch_poll_interval
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                return batch
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise Exception(f"Batch job {batch_id} ended with status: {batch.status}")
+            logger.debug(f"Batch job {batch_id} status: {batch.status}")
+            await asyncio.sleep(poll_interval)
+    
+    async def fetch_results(self, output_file_id: str) -> Dict[str, Dict[str, Any]]:
+        """Download batch output and convert each line to a completion result"""
+        content = await self.client.files.content(output_file_id)
+        
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            entry = orjson.loads(line)
+            response = entry.get('response') or {}
+            if entry.get('error') or response.get('status_code') != 200:
+                logger.warning(f"Batch request {entry.get('custom_id')} failed: {entry.get('error')}")
+                continue
+            
+            body = response['body']
+            usage = body['usage']
+            cost = self.calculate_cost(usage['prompt_tokens'], usage['completion_tokens'], BATCH_COST_FACTOR)
+            results[entry['custom_id']] = {
+                'content': body['choices'][0]['message']['content'],
+                'model': self.config.name,
+                'cost': cost,
+                'input_tokens': usage['prompt_tokens'],
+                'output_tokens': usage['completion_tokens'],
+                'finish_reason': body['choices'][0]['finish_reason']
+            }
+        return results
+    
+    async def run_batch(self, prompts: List[str], **kwargs) -> List[Optional[Dict[str, Any]]]:
+        """Run prompts through the Batch API and return results in prompt order"""
+        batch_id = await self.submit_batch(prompts, **kwargs)
+        batch = await self.poll_batch(batch_id)
+        results = await self.fetch_results(batch.output_file_id) if batch.output_file_id else {}
+        logger.info(f"Batch job {batch_id} completed: {len(results)}/{len(prompts)} succeeded")
+        return [results.get(str(i)) for i in range(len(prompts))]
 
 class ClaudeInterface(AIModelInterface):
     """Anthropic Claude models interface"""
     
+    retryable_errors = ANTHROPIC_RETRYABLE_ERRORS
+    
     def __init__(self, model_config):
         super().__init__(model_config)
-        self.client = anthropic.AsyncAnthropic(api_key=model_config.api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=model_config.api_key, http_client=get_shared_http_client('anthropic'))
+    
+    @staticmethod
+    def _messages(prompt: str, cached_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Build the user message, marking a static prefix as a prompt-cache breakpoint"""
+        if not cached_prefix:
+            return [{"role": "user", "content": prompt}]
+        
+        # Everything up to and including the cache_control block is cached;
+        # the per-call prompt after it is billed normally.
+        return [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": cached_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ]
+        }]
+    
+    def _message_params(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build messages.create parameters for a prompt"""
+        # Extract max_tokens from kwargs if provided, otherwise use default
+        max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
+        # Remove unsupported parameters
+        kwargs.pop('thinking_budget', None)
+        cached_prefix = kwargs.pop('cached_prefix', None)
+        
+        return {
+            "model": self.config.name,
+            "messages": self._messages(prompt, cached_prefix),
+            "temperature": self.config.temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate completion using Claude API"""
+        return await self._call_with_retry(lambda: self._generate_completion(prompt, **kwargs))
+    
+    async def _generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Single Claude API request"""
         try:
-            # Extract max_tokens from kwargs if provided, otherwise use default
-            max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
-            # Remove unsupported parameters
-            kwargs.pop('thinking_budget', None)
+            response = await self.client.messages.create(**self._message_params(prompt, **kwargs))
             
-            params = {
-                "model": self.config.name,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": self.config.temperature,
-                "max_tokens": max_tokens,
-                **kwargs
-            }
-            
-            response = await self.client.messages.create(**params)
-            
-            # Calculate cost (approximate token counting)
-            input_tokens = len(prompt.split()) * 1.3  # Rough estimation
-            output_tokens = len(response.content[0].text.split()) * 1.3
-            cost = self.calculate_cost(int(input_tokens), int(output_tokens))
+            # Calculate cost from the token counts reported by the API
+            input_tokens = response.usage.input_tokens
+            output_tokens = response.usage.output_tokens
+            cost = self.calculate_cost(input_tokens, output_tokens)
             
             result = {
                 'content': response.content[0].text,
                 'model': self.config.name,
                 'cost': cost,
-                'input_tokens': int(input_tokens),
-                'output_tokens': int(output_tokens),
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
                 'stop_reason': response.stop_reason
             }
             
-            logger.info(f"Claude completion - Cost: ${cost:.4f}, Tokens: ~{int(input_tokens)}+{int(output_tokens)}")
+            logger.info(f"Claude completion - Cost: ${cost:.4f}, Tokens: {input_tokens}+{output_tokens}")
             return result
             
         except Exception as e:
             logger.error(f"Claude API error: {e}")
             raise
+    
+    async def generate_completion_stream(self, prompt: str, final: Optional[Dict[str, Any]] = None,
+                                         **kwargs) -> AsyncIterator[str]:
+        """Stream completion text as it arrives; usage and cost are filled into `final` at the end"""
+        try:
+            async with self.client.messages.stream(**self._message_params(prompt, **kwargs)) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                message = await stream.get_final_message()
+        except Exception as e:
+            logger.error(f"Claude API error: {e}")
+            raise
+        
+        usage = message.usage
+        cost = self.calculate_cost(usage.input_tokens, usage.output_tokens)
+        if final is not None:
+            final.update({
+                'content': message.content[0].text,
+                'model': self.config.name,
+                'cost': cost,
+                'input_tokens': usage.input_tokens,
+                'output_tokens': usage.output_tokens,
+                'stop_reason': message.stop_reason
+            })
+        
+        logger.info(f"Claude stream - Cost: ${cost:.4f}, Tokens: {usage.input_tokens}+{usage.output_tokens}")
+    
+    async def submit_message_batch(self, prompts: List[str], **kwargs) -> str:
+        """Submit prompts as one Message Batches job, using the prompt index as custom_id"""
+        max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
+        kwargs.pop('thinking_budget', None)
+        cached_prefix = kwargs.pop('cached_prefix', None)
+        
+        try:
+            batch = await self.client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": str(i),
+                        "params": {
+                            "model": self.config.name,
+                            "messages": self._messages(prompt, cached_prefix),
+                            "temperature": self.config.temperature,
+                            "max_tokens": max_tokens,
+                            **kwargs
+                        }
+                    }
+                    for i, prompt in enumerate(prompts)
+                ]
+            )
+            logger.info(f"Created message batch: {batch.id}")
+            return batch.id
+            
+        except Exception as e:
+            logger.error(f"Failed to create message batch: {e}")
+            raise
+    
+    async def run_batch(self, prompts: List[str], **kwargs) -> List[Optional[Dict[str, Any]]]:
+        """Run prompts through the Message Batches API and return results in prompt order"""
+        batch_id = await self.submit_message_batch(prompts, **kwargs)
+        
+        while True:
+            batch = await self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            logger.debug(f"Message batch {batch_id} status: {batch.processing_status}")
+            await asyncio.sleep(config.processing.batch_poll_interval)
+        
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                logger.warning(f"Batch request {entry.custom_id} {entry.result.type}")
+                continue
+            
+            message = entry.result.message
+            usage = message.usage
+            cost = self.calculate_cost(usage.input_tokens, usage.output_tokens, BATCH_COST_FACTOR)
+            results[entry.custom_id] = {
+                'content': message.content[0].text,
+                'model': self.config.name,
+                'cost': cost,
+                'input_tokens': usage.input_tokens,
+                'output_tokens': usage.output_tokens,
+                'stop_reason': message.stop_reason
+            }
+        
+        logger.info(f"Message batch {batch_id} completed: {len(results)}/{len(prompts)} succeeded")
+        return [results.get(str(i)) for i in range(len(prompts))]
 
 class GeminiInterface(AIModelInterface):
     """Google Gemini models interface"""
     
+    retryable_errors = GEMINI_RETRYABLE_ERRORS
+    
     def __init__(self, model_config):
         super().__init__(model_config)
         genai.configure(api_key=model_config.api_key)
         self.model = genai.GenerativeModel(model_config.name)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate completion using Gemini API"""
+        return await self._call_with_retry(lambda: self._generate_completion(prompt, **kwargs))
+    
+    async def _generate_completion(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Single Gemini API request"""
         try:
             # Extract max_tokens from kwargs if provided, otherwise use default
             max_tokens = kwargs.pop('max_tokens', self.config.max_tokens)
             # For Gemini, also check for max_output_tokens
             max_output_tokens = kwargs.pop('max_output_tokens', max_tokens)
+            # Gemini 2.5 caches repeated prompt prefixes implicitly, so the static
+            # context only needs to lead the prompt
+            cached_prefix = kwargs.pop('cached_prefix', None)
+            if cached_prefix:
+                prompt = f"{cached_prefix}\n\n{prompt}"
             
             # Debug logging
             logger.debug(f"Gemini max_output_tokens: {max_output_tokens}")
@@ -216,10 +545,11 @@ class GeminiInterface(AIModelInterface):
                 generation_config=generation_config
             )
             
-            # Calculate cost (approximate token counting)
-            input_tokens = len(prompt.split()) * 1.3  # Rough estimation
-            output_tokens = len(response.text.split()) * 1.3
-            cost = self.calculate_cost(int(input_tokens), int(output_tokens))
+            # Calculate cost from the token counts reported by the API
+            usage = response.usage_metadata
+            input_tokens = usage.prompt_token_count or 0
+            output_tokens = usage.candidates_token_count or 0
+            cost = self.calculate_cost(input_tokens, output_tokens)
             
             finish_reason = response.candidates[0].finish_reason.name if response.candidates else 'STOP'
             
@@ -227,17 +557,17 @@ class GeminiInterface(AIModelInterface):
                 'content': response.text,
                 'model': self.config.name,
                 'cost': cost,
-                'input_tokens': int(input_tokens),
-                'output_tokens': int(output_tokens),
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
                 'finish_reason': finish_reason
             }
             
             # Check for truncation
             if finish_reason in ['MAX_TOKENS', 'LENGTH']:
                 logger.warning(f"Gemini response may be truncated! Finish reason: {finish_reason}, "
-                             f"Max tokens: {self.config.max_tokens}, Output tokens: ~{int(output_tokens)}")
+                             f"Max tokens: {self.config.max_tokens}, Output tokens: {output_tokens}")
             
-            logger.info(f"Gemini completion - Cost: ${cost:.4f}, Tokens: ~{int(input_tokens)}+{int(output_tokens)}, "
+            logger.info(f"Gemini completion - Cost: ${cost:.4f}, Tokens: {input_tokens}+{output_tokens}, "
                        f"Finish: {finish_reason}")
             return result
             
@@ -257,34 +587,143 @@ class AIModelManager:
             'claude_sonnet': ClaudeInterface(config.models['claude_sonnet']),
             'claude_opus': ClaudeInterface(config.models['claude_opus'])
         }
-        self.total_cost = 0.0
+        # Spend per model key; the overall total is only summed when read
+        self.cost_by_model: Counter = Counter()
+        # Worst-case cost of live calls that have not reported their spend yet
+        self.reserved_cost = 0.0
+        self.cache = LLMCache(config.processing.llm_cache_path)
     
-    async def get_completion(self, model_name: str, prompt: str, **kwargs) -> Dict[str, Any]:
+    @property
+    def total_cost(self) -> float:
+        """Total spend across all models"""
+        return sum(self.cost_by_model.values())
+    
+    async def get_completion(self, model_name: str, prompt: str, batchable: bool = False, **kwargs) -> Dict[str, Any]:
         """Get completion from specified model"""
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
         
-        # Check cost limits
-        await self._check_cost_limits()
+        if batchable and hasattr(self.models[model_name], 'run_batch'):
+            result = (await self.run_bulk(model_name, [prompt], **kwargs))[0]
+            if result is None:
+                raise Exception(f"Batch completion failed for model: {model_name}")
+            return result
         
         model = self.models[model_name]
-        result = await model.generate_completion(prompt, **kwargs)
         
-        self.total_cost += result['cost']
+        # Only temperature-0 calls are reproducible enough to cache, unless every response
+        # is cached so development reruns replay earlier output
+        cache_key = None
+        cacheable = model.config.temperature == 0 or config.processing.llm_cache_all
+        if cacheable and not any(k in kwargs for k in NONDETERMINISTIC_KWARGS):
+            cache_key = LLMCache.make_key(
+                model.config.name, prompt, model.config.temperature,
+                kwargs.get('max_tokens', model.config.max_tokens),
+                **{k: v for k, v in kwargs.items() if k != 'max_tokens'}
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"LLM cache hit for {model_name}")
+                return {**cached, 'cost': 0.0, 'cached': True}
+        
+        # Check cost limits, reserving this call's worst case so concurrent calls cannot overshoot together
+        reservation = model.estimate_cost(prompt, **kwargs)
+        await self._check_cost_limits(reservation)
+        self.reserved_cost += reservation
+        try:
+            result = await model.generate_completion(prompt, **kwargs)
+        finally:
+            self.reserved_cost -= reservation
+        
+        self.cost_by_model[model_name] += result['cost']
+        if cache_key is not None:
+            await self.cache.set(cache_key, result)
         return result
     
-    async def _check_cost_limits(self):
-        """Check if cost limits are exceeded"""
-        if self.total_cost >= config.processing.max_daily_cost:
-            raise Exception(f"Daily cost limit exceeded: ${self.total_cost:.2f}")
+    async def stream_completion(self, model_name: str, prompt: str,
+                                final: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[str]:
+        """Yield completion text as it is generated; the full result is filled into `final`"""
+        if model_name not in self.models:
+            raise ValueError(f"Unknown model: {model_name}")
+        
+        model = self.models[model_name]
+        final = {} if final is None else final
+        
+        if not hasattr(model, 'generate_completion_stream'):
+            # No streaming support for this provider; deliver the whole completion at once
+            final.update(await self.get_completion(model_name, prompt, **kwargs))
+            yield final['content']
+            return
         
-        if self.total_cost >= config.processing.cost_alert_threshold:
-            logger.warning(f"Cost alert: ${self.total_cost:.2f} / ${config.processing.max_daily_cost:.2f}")
+        await self._check_cost_limits()
+        
+        async for text in model.generate_completion_stream(prompt, final=final, **kwargs):
+            yield text
+        
+        self.cost_by_model[model_name] += final['cost']
+    
+    async def get_completions_bulk(self, model_name: str, prompts: List[str],
+                                   concurrency: Optional[int] = None, **kwargs) -> List[Any]:
+        """Run prompts concurrently; a failed call is returned in place as its exception"""
+        semaphore = asyncio.Semaphore(concurrency or config.processing.max_concurrent)
+        
+        async def _one(prompt: str):
+            async with semaphore:
+                return await self.get_completion(model_name, prompt, **kwargs)
+        
+        # Identical prompts share one request; its result is broadcast to every index
+        unique_prompts = list(dict.fromkeys(prompts))
+        if len(unique_prompts) < len(prompts):
+            logger.info(f"Deduplicated {len(prompts)} prompts to {len(unique_prompts)} requests")
+        
+        unique_results = await asyncio.gather(*(_one(prompt) for prompt in unique_prompts), return_exceptions=True)
+        # Per-prompt failures stay in place, but hitting the cost limit stops the caller
+        for result in unique_results:
+            if isinstance(result, CostLimitExceeded):
+                raise result
+        result_by_prompt = dict(zip(unique_prompts, unique_results))
+        return [result_by_prompt[prompt] for prompt in prompts]
+    
+    async def run_bulk(self, model_name: str, prompts: List[str], **kwargs) -> List[Optional[Dict[str, Any]]]:
+        """Run many prompts at batch pricing; failed requests come back as None"""
+        if model_name not in self.models:
+            raise ValueError(f"Unknown model: {model_name}")
+        
+        await self._check_cost_limits()
+        
+        model = self.models[model_name]
+        if not hasattr(model, 'run_batch'):
+            # No batch endpoint for this provider; fall back to live calls
+            return [await self.get_completion(model_name, prompt, **kwargs) for prompt in prompts]
+        
+        results = await model.run_batch(prompts, **kwargs)
+        self.cost_by_model[model_name] += sum(result['cost'] for result in results if result)
+        return results
+    
+    async def _check_cost_limits(self, pending_cost: float = 0.0):
+        """Check if cost limits are exceeded, counting calls in flight and the one about to start"""
+        total_cost = self.total_cost
+        if total_cost >= config.processing.max_daily_cost:
+            raise CostLimitExceeded(f"Daily cost limit exceeded: ${total_cost:.2f}")
+        
+        committed_cost = total_cost + self.reserved_cost + pending_cost
+        if committed_cost > config.processing.max_daily_cost:
+            raise CostLimitExceeded(f"Daily cost limit exceeded: ${total_cost:.2f} spent, "
+                                    f"${committed_cost - total_cost:.2f} more in flight")
+        
+        if total_cost >= config.processing.cost_alert_threshold:
+            logger.warning(f"Cost alert: ${total_cost:.2f} / ${config.processing.max_daily_cost:.2f}")
+    
+    async def aclose(self):
+        """Release pooled HTTP connections and the response cache"""
+        await close_shared_http_clients()
+        self.cache.close()
     
     def get_total_usage_stats(self) -> Dict[str, Any]:
         """Get usage statistics for all models"""
         stats = {
             'total_cost': self.total_cost,
+            'cache': self.cache.get_stats(),
             'models': {}
         }
         
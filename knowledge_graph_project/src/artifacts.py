@@ -0,0 +1,140 @@
+"""
+Read/write helpers for intermediate phase artifacts in output/
+"""
+import hashlib
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import zstandard
+from loguru import logger
+
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
+# Project-relative like the LLM cache; never a shared temp dir other users can write to
+CACHE_DIR = os.path.join("cache", "artifacts")
+CACHE_DIR_MODE = 0o700
+
+# Relation lists and the fields whose values repeat heavily across them
+RELATION_LISTS = ('weighted_relations', 'final_relations', 'missing_relations')
+INTERNED_FIELDS = ('relation_type', 'mapped_type', 'refined_type', 'source_code', 'target_code')
+
+
+# numpy scalars and arrays serialize natively; json_default covers the rest
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def json_default(obj: Any) -> Any:
+    """Fallback for values orjson cannot serialize, such as pd.Timestamp or numpy scalars inside pandas objects"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize with orjson, tolerating the numpy and pandas values phase results pick up"""
+    option = JSON_OPTIONS | orjson.OPT_INDENT_2 if indent else JSON_OPTIONS
+    return orjson.dumps(obj, default=json_default, option=option)
+
+
+def save_artifact(obj: Any, path: str) -> None:
+    """Save a phase artifact as readable JSON plus a zstd-compressed sibling"""
+    # orjson writes UTF-8 directly, so Korean text stays readable as with ensure_ascii=False
+    with open(path, 'wb') as f:
+        f.write(dumps_json(obj, indent=True))
+
+    payload = dumps_json(obj)
+    with open(path + ZSTD_SUFFIX, 'wb') as f:
+        f.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload))
+
+
+def _intern_relation_fields(data: Any) -> Any:
+    """Share one string object per distinct value of repeated relation fields"""
+    if not isinstance(data, dict):
+        return data
+
+    cache: Dict[str, str] = {}
+    for list_key in RELATION_LISTS:
+        relations = data.get(list_key)
+        if not isinstance(relations, list):
+            continue
+        for relation in relations:
+            if not isinstance(relation, dict):
+                continue
+            for field in INTERNED_FIELDS:
+                value = relation.get(field)
+                if isinstance(value, str):
+                    relation[field] = cache.setdefault(value, value)
+    return data
+
+
+def load_artifact(path: str) -> Any:
+    """Load a phase artifact, preferring an up-to-date .zst sibling over plain JSON"""
+    return _intern_relation_fields(_decode_source(*_resolve_source(path)))
+
+
+def load_cached(path: str) -> Any:
+    """Load a phase artifact through a compact JSON cache keyed by the source file's SHA-256"""
+    source_path, compressed = _resolve_source(path)
+
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    cache_dir = _private_cache_dir()
+    cache_path = os.path.join(cache_dir, f"{digest.hexdigest()}.json") if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            # Uncompressed and unindented, so a hit skips zstd and whitespace
+            with open(cache_path, 'rb') as f:
+                return _intern_relation_fields(orjson.loads(f.read()))
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable artifact cache {cache_path}: {e}")
+
+    data = _intern_relation_fields(_decode_source(source_path, compressed))
+    if cache_path:
+        try:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write artifact cache {cache_path}: {e}")
+    return data
+
+
+def _private_cache_dir() -> Optional[str]:
+    """CACHE_DIR, created owner-only; None if it belongs to someone else or others can write to it"""
+    try:
+        os.makedirs(CACHE_DIR, mode=CACHE_DIR_MODE, exist_ok=True)
+        st = os.stat(CACHE_DIR)
+    except OSError as e:
+        logger.warning(f"Artifact cache disabled, cannot create {CACHE_DIR}: {e}")
+        return None
+
+    if (hasattr(os, 'getuid') and st.st_uid != os.getuid()) or st.st_mode & 0o022:
+        logger.warning(f"Artifact cache disabled: {CACHE_DIR} is not private to this user")
+        return None
+    return CACHE_DIR
+
+
+def _resolve_source(path: str) -> Tuple[str, bool]:
+    """Pick the file to read for path: the .zst sibling if it is up to date"""
+    zst_path = path + ZSTD_SUFFIX
+    if os.path.exists(zst_path):
+        if not os.path.exists(path) or os.path.getmtime(zst_path) >= os.path.getmtime(path):
+            return zst_path, True
+        logger.warning(f"{zst_path} is older than {path}; loading plain JSON")
+    return path, False
+
+
+def _decode_source(source_path: str, compressed: bool) -> Any:
+    """Decode a plain or zstd-compressed JSON file"""
+    with open(source_path, 'rb') as f:
+        if compressed:
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                return orjson.loads(reader.read())
+        return orjson.loads(f.read())
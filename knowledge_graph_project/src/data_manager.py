@@ -1,18 +1,297 @@
 """
 Database connection and data extraction utilities
 """
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 import pandas as pd
-from typing import List, Dict, Any
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import feather
+from typing import List, Dict, Any, Iterator, Optional
 from loguru import logger
 from config.settings import config
 
+# PostgreSQL type OIDs for text, varchar, bpchar and name
+TEXT_TYPE_OIDS = {25, 1043, 1042, 19}
+
+# Label columns with a handful of distinct values, loaded as pandas categoricals
+LOW_CARDINALITY_COLUMNS = {
+    'school_type', 'grade_range', 'domain_name', 'domain_code', 'level_code',
+    'relation_type', 'term_type', 'method'
+}
+
+# Columns iter_document_corpus reads from each extraction
+STANDARD_DOCUMENT_COLUMNS = [
+    'standard_id', 'standard_code', 'standard_title', 'standard_content', 'domain_name',
+    'school_type', 'grade_range', 'domain_id', 'level_id', 'element_id', 'element_name'
+]
+LEVEL_DOCUMENT_COLUMNS = [
+    'achievement_level_id', 'standard_code', 'level_code', 'level_description',
+    'standard_id', 'standard_content'
+]
+
+# Rows converted to dicts at a time while streaming documents
+DOCUMENT_SLICE_ROWS = 1000
+
+ACHIEVEMENT_STANDARDS_QUERY = """
+    SELECT 
+        s.standard_id,
+        s.standard_code,
+        s.standard_title,
+        s.standard_content,
+        s.level_id,
+        s.domain_id,
+        s.element_id,
+        s.standard_order,
+        ce.element_name,
+        ce.element_description,
+        d.domain_name,
+        d.domain_code,
+        sl.school_type,
+        sl.grade_range,
+        sl.grade_start,
+        sl.grade_end,
+        sl.level_code
+    FROM curriculum.achievement_standards s
+    JOIN curriculum.domains d ON s.domain_id = d.domain_id
+    JOIN curriculum.school_levels sl ON s.level_id = sl.level_id
+    LEFT JOIN curriculum.content_elements ce ON s.element_id = ce.element_id
+    ORDER BY s.standard_code
+"""
+
+ACHIEVEMENT_LEVELS_QUERY = """
+    SELECT 
+        sal.sal_id as achievement_level_id,
+        sal.standard_id,
+        sal.level_code,
+        al.level_name,
+        sal.level_description,
+        s.standard_code
+    FROM curriculum.standard_achievement_levels sal
+    JOIN curriculum.achievement_levels al ON sal.level_code = al.level_code
+    JOIN curriculum.achievement_standards s ON sal.standard_id = s.standard_id
+    ORDER BY s.standard_code, al.level_order
+"""
+
+CONTENT_ELEMENTS_QUERY = """
+    SELECT 
+        ce.element_id,
+        ce.level_id,
+        ce.domain_id,
+        ce.category_id,
+        ce.element_name,
+        ce.element_description,
+        ce.element_order,
+        d.domain_name,
+        d.domain_code,
+        sl.school_type,
+        sl.grade_range,
+        c.category_name
+    FROM curriculum.content_elements ce
+    JOIN curriculum.domains d ON ce.domain_id = d.domain_id
+    JOIN curriculum.school_levels sl ON ce.level_id = sl.level_id
+    JOIN curriculum.categories c ON ce.category_id = c.category_id
+    ORDER BY ce.level_id, ce.domain_id, ce.element_order
+"""
+
+TERMS_SYMBOLS_QUERY = """
+    SELECT 
+        ts.term_id,
+        ts.level_id,
+        ts.domain_id,
+        ts.term_name,
+        ts.term_description,
+        ts.term_type,
+        ts.latex_expression,
+        d.domain_name,
+        d.domain_code,
+        sl.school_type,
+        sl.grade_range
+    FROM curriculum.terms_symbols ts
+    JOIN curriculum.domains d ON ts.domain_id = d.domain_id
+    JOIN curriculum.school_levels sl ON ts.level_id = sl.level_id
+    ORDER BY ts.level_id, ts.domain_id, ts.term_name
+"""
+
+STANDARD_RELATIONS_QUERY = """
+    SELECT 
+        asr.rel_id,
+        asr.src_standard_id,
+        asr.dst_standard_id,
+        asr.relation_type,
+        asr.rationale,
+        asr.method,
+        asr.confidence,
+        s1.standard_code as src_code,
+        s2.standard_code as dst_code
+    FROM curriculum.achievement_standard_relations asr
+    JOIN curriculum.achievement_standards s1 ON asr.src_standard_id = s1.standard_id
+    JOIN curriculum.achievement_standards s2 ON asr.dst_standard_id = s2.standard_id
+    ORDER BY asr.relation_type, asr.confidence DESC
+"""
+
+STANDARD_TERMS_QUERY = """
+    SELECT 
+        st.st_id,
+        st.standard_id,
+        st.term_id,
+        st.relation_type,
+        st.method,
+        st.confidence,
+        s.standard_code,
+        ts.term_name,
+        ts.term_type
+    FROM curriculum.standard_terms st
+    JOIN curriculum.achievement_standards s ON st.standard_id = s.standard_id
+    JOIN curriculum.terms_symbols ts ON st.term_id = ts.term_id
+    ORDER BY s.standard_code, ts.term_name
+"""
+
+COMPETENCIES_QUERY = """
+    SELECT 
+        c.comp_id,
+        c.comp_code,
+        c.comp_name,
+        c.description
+    FROM curriculum.competencies c
+    ORDER BY c.comp_code
+"""
+
+PREREQUISITE_SUGGESTIONS_QUERY = """
+    SELECT 
+        src_standard_id,
+        dst_standard_id,
+        relation_type,
+        rationale,
+        method,
+        confidence
+    FROM curriculum.v_prerequisite_suggestions
+    ORDER BY confidence DESC
+"""
+
+HORIZONTAL_SUGGESTIONS_QUERY = """
+    SELECT 
+        src_standard_id,
+        dst_standard_id,
+        relation_type,
+        rationale,
+        method,
+        confidence
+    FROM curriculum.v_horizontal_suggestions
+    ORDER BY confidence DESC
+"""
+
+REPRESENTATION_TYPES_QUERY = """
+    SELECT 
+        rep_type_id,
+        type_name,
+        description
+    FROM curriculum.representation_types
+    ORDER BY rep_type_id
+"""
+
+# Standards per domain and per grade range, aggregated on the server
+DISTRIBUTION_STATS_QUERY = """
+    SELECT 'domain_name' AS dimension, d.domain_name AS label, COUNT(*) AS count
+    FROM curriculum.achievement_standards s
+    JOIN curriculum.domains d ON s.domain_id = d.domain_id
+    GROUP BY d.domain_name
+    UNION ALL
+    SELECT 'grade_range', sl.grade_range, COUNT(*)
+    FROM curriculum.achievement_standards s
+    JOIN curriculum.school_levels sl ON s.level_id = sl.level_id
+    GROUP BY sl.grade_range
+    ORDER BY dimension, count DESC, label
+"""
+
+# prepare_document_corpus documents built server-side: one JSON array of standards, one of levels
+DOCUMENT_CORPUS_QUERY = f"""
+    SELECT
+        (SELECT json_agg(json_build_object(
+            'id', 'standard_' || s.standard_id,
+            'type', 'achievement_standard',
+            'code', s.standard_code,
+            'title', s.standard_title,
+            'content', s.standard_content,
+            'domain', s.domain_name,
+            'school_type', s.school_type,
+            'grade_range', s.grade_range,
+            'metadata', json_build_object(
+                'domain_id', s.domain_id,
+                'level_id', s.level_id,
+                'element_id', s.element_id,
+                'element_name', s.element_name
+            )
+        )) FROM ({ACHIEVEMENT_STANDARDS_QUERY}) AS s) AS standards,
+        (SELECT json_agg(json_build_object(
+            'id', 'level_' || l.achievement_level_id,
+            'type', 'achievement_level',
+            'standard_code', l.standard_code,
+            'level_code', l.level_code,
+            'content', l.level_description,
+            'metadata', json_build_object(
+                'standard_id', l.standard_id,
+                'parent_standard', (
+                    SELECT ps.standard_content FROM curriculum.achievement_standards ps
+                    WHERE ps.standard_id = l.standard_id
+                )
+            )
+        )) FROM ({ACHIEVEMENT_LEVELS_QUERY}) AS l) AS levels
+"""
+
+# Core tables fetched together by extract_all_curriculum_data: key -> (query, log label)
+CORE_QUERIES = {
+    'achievement_standards': (ACHIEVEMENT_STANDARDS_QUERY, 'achievement standards'),
+    'achievement_levels': (ACHIEVEMENT_LEVELS_QUERY, 'achievement levels'),
+    'content_elements': (CONTENT_ELEMENTS_QUERY, 'content elements'),
+    'terms_symbols': (TERMS_SYMBOLS_QUERY, 'terms and symbols')
+}
+
+# v1.3.0 tables and views, which older schemas may not have: key -> (query, log label)
+OPTIONAL_QUERIES = {
+    'standard_relations': (STANDARD_RELATIONS_QUERY, 'standard relations'),
+    'standard_terms': (STANDARD_TERMS_QUERY, 'standard-term mappings'),
+    'competencies': (COMPETENCIES_QUERY, 'competencies'),
+    'prerequisite_suggestions': (PREREQUISITE_SUGGESTIONS_QUERY, 'prerequisite suggestions'),
+    'horizontal_suggestions': (HORIZONTAL_SUGGESTIONS_QUERY, 'horizontal suggestions'),
+    'representation_types': (REPRESENTATION_TYPES_QUERY, 'representation types')
+}
+
+# Column layout of the Arrow document corpus; low-cardinality labels are dictionary-encoded
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+DOCUMENT_TABLE_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('type', _CATEGORY),
+    ('code', pa.string()),
+    ('title', pa.string()),
+    ('content', pa.string()),
+    ('domain', _CATEGORY),
+    ('school_type', _CATEGORY),
+    ('grade_range', _CATEGORY),
+    ('level_code', _CATEGORY),
+    ('standard_id', pa.int64())
+])
+
 class DatabaseManager:
     """PostgreSQL database manager for curriculum data"""
     
     def __init__(self):
         self.connection_string = config.database.postgresql_url
+        self.pool_size = config.database.postgresql_pool_size
         self._connection = None
+        self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def connect(self):
         """Establish database connection"""
@@ -27,274 +306,243 @@ class DatabaseManager:
         """Close database connection"""
         if self._connection:
             self._connection.close()
+            self._connection = None
             logger.info("Disconnected from database")
     
-    def extract_achievement_standards(self) -> pd.DataFrame:
-        """Extract all achievement standards"""
-        query = """
-        SELECT 
-            s.standard_id,
-            s.standard_code,
-            s.standard_title,
-            s.standard_content,
-            s.level_id,
-            s.domain_id,
-            s.element_id,
-            s.standard_order,
-            ce.element_name,
-            ce.element_description,
-            d.domain_name,
-            d.domain_code,
-            sl.school_type,
-            sl.grade_range,
-            sl.grade_start,
-            sl.grade_end,
-            sl.level_code
-        FROM curriculum.achievement_standards s
-        JOIN curriculum.domains d ON s.domain_id = d.domain_id
-        JOIN curriculum.school_levels sl ON s.level_id = sl.level_id
-        LEFT JOIN curriculum.content_elements ce ON s.element_id = ce.element_id
-        ORDER BY s.standard_code
-        """
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Connection pool shared by this manager's extractions, opened on first use"""
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(1, self.pool_size, self.connection_string)
+        return self._pool
+    
+    @contextmanager
+    def _borrowed_connection(self, connection=None) -> Iterator[Any]:
+        """The given or direct connection, else one borrowed from the pool for the duration"""
+        connection = connection or self._connection
+        if connection is not None:
+            yield connection
+            return
         
+        pool = self._get_pool()
+        connection = pool.getconn()
         try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} achievement standards")
-            return df
-        except Exception as e:
-            logger.error(f"Failed to extract achievement standards: {e}")
-            raise
+            yield connection
+        finally:
+            pool.putconn(connection)
     
-    def extract_achievement_levels(self) -> pd.DataFrame:
-        """Extract all achievement levels"""
-        query = """
-        SELECT 
-            sal.sal_id as achievement_level_id,
-            sal.standard_id,
-            sal.level_code,
-            al.level_name,
-            sal.level_description,
-            s.standard_code,
-            s.standard_content
-        FROM curriculum.standard_achievement_levels sal
-        JOIN curriculum.achievement_levels al ON sal.level_code = al.level_code
-        JOIN curriculum.achievement_standards s ON sal.standard_id = s.standard_id
-        ORDER BY s.standard_code, al.level_order
-        """
+    def close(self):
+        """Close pooled connections and any direct connection"""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+        self.disconnect()
+    
+    def _cache_path(self, query: str) -> Optional[str]:
+        """Parquet file caching a query's result, or None when the extraction cache is disabled"""
+        cache_dir = config.processing.extraction_cache_dir
+        if not cache_dir:
+            return None
         
-        try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} achievement levels")
-            return df
-        except Exception as e:
-            logger.error(f"Failed to extract achievement levels: {e}")
-            raise
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.connection_string or "", config.processing.extraction_schema_version, query):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return os.path.join(cache_dir, f"{digest.hexdigest()}.parquet")
     
-    def extract_content_elements(self) -> pd.DataFrame:
-        """Extract content elements"""
-        query = """
-        SELECT 
-            ce.element_id,
-            ce.level_id,
-            ce.domain_id,
-            ce.category_id,
-            ce.element_name,
-            ce.element_description,
-            ce.element_order,
-            d.domain_name,
-            d.domain_code,
-            sl.school_type,
-            sl.grade_range,
-            c.category_name
-        FROM curriculum.content_elements ce
-        JOIN curriculum.domains d ON ce.domain_id = d.domain_id
-        JOIN curriculum.school_levels sl ON ce.level_id = sl.level_id
-        JOIN curriculum.categories c ON ce.category_id = c.category_id
-        ORDER BY ce.level_id, ce.domain_id, ce.element_order
-        """
+    def _load_cached_frame(self, path: Optional[str]) -> Optional[pd.DataFrame]:
+        """Read a cached extraction, if there is one"""
+        if path is None or not os.path.exists(path):
+            return None
         
         try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} content elements")
-            return df
-        except Exception as e:
-            logger.error(f"Failed to extract content elements: {e}")
-            raise
+            return pd.read_parquet(path, engine="pyarrow")
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Ignoring unreadable extraction cache {path}: {e}")
+            return None
     
-    def extract_terms_symbols(self) -> pd.DataFrame:
-        """Extract terms and symbols"""
-        query = """
-        SELECT 
-            ts.term_id,
-            ts.level_id,
-            ts.domain_id,
-            ts.term_name,
-            ts.term_description,
-            ts.term_type,
-            ts.latex_expression,
-            d.domain_name,
-            d.domain_code,
-            sl.school_type,
-            sl.grade_range
-        FROM curriculum.terms_symbols ts
-        JOIN curriculum.domains d ON ts.domain_id = d.domain_id
-        JOIN curriculum.school_levels sl ON ts.level_id = sl.level_id
-        ORDER BY ts.level_id, ts.domain_id, ts.term_name
-        """
+    def _store_cached_frame(self, path: Optional[str], df: pd.DataFrame):
+        """Write an extraction to the cache; failures only cost a re-query next run"""
+        if path is None:
+            return
         
         try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} terms and symbols")
-            return df
-        except Exception as e:
-            logger.error(f"Failed to extract terms and symbols: {e}")
-            raise
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write aside and rename so concurrent extractions never see a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            df.to_parquet(temp_path, engine="pyarrow", compression="zstd", index=False)
+            os.replace(temp_path, path)
+        except (OSError, ValueError, pa.ArrowException) as e:
+            logger.warning(f"Failed to cache extraction at {path}: {e}")
     
-    def extract_standard_relations(self) -> pd.DataFrame:
-        """Extract achievement standard relations from v1.3.0 schema"""
-        query = """
-        SELECT 
-            asr.rel_id,
-            asr.src_standard_id,
-            asr.dst_standard_id,
-            asr.relation_type,
-            asr.rationale,
-            asr.method,
-            asr.confidence,
-            s1.standard_code as src_code,
-            s2.standard_code as dst_code,
-            s1.standard_content as src_content,
-            s2.standard_content as dst_content
-        FROM curriculum.achievement_standard_relations asr
-        JOIN curriculum.achievement_standards s1 ON asr.src_standard_id = s1.standard_id
-        JOIN curriculum.achievement_standards s2 ON asr.dst_standard_id = s2.standard_id
-        ORDER BY asr.relation_type, asr.confidence DESC
-        """
+    def _read_frame(self, query: str, connection=None, use_cache: bool = True) -> pd.DataFrame:
+        """Run a SELECT through COPY ... TO STDOUT and parse the CSV stream into Arrow columns"""
+        # Diagnostics must see the live database, so they skip the extraction cache both ways
+        cache_path = self._cache_path(query) if use_cache else None
+        cached = self._load_cached_frame(cache_path)
+        if cached is not None:
+            return cached
         
-        try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} standard relations")
-            return df
-        except Exception as e:
-            logger.warning(f"No standard relations found or table doesn't exist: {e}")
-            return pd.DataFrame()
+        with self._borrowed_connection(connection) as connection:
+            try:
+                with connection.cursor() as cursor:
+                    # Column types, so text codes such as '01' are not parsed as numbers
+                    # and repeated labels are dictionary-encoded
+                    cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0")
+                    text_columns = {
+                        column.name: _CATEGORY if column.name in LOW_CARDINALITY_COLUMNS else pa.string()
+                        for column in cursor.description
+                        if column.type_code in TEXT_TYPE_OIDS
+                    }
+                    
+                    # Small results stay in memory; large ones spill to a temp file instead of RAM
+                    with tempfile.SpooledTemporaryFile(max_size=config.processing.copy_spool_max_bytes) as buffer:
+                        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", buffer)
+                        buffer.seek(0)
+                        # COPY writes NULL unquoted and '' as "", so only unquoted empty fields are nulls
+                        table = pa_csv.read_csv(buffer, convert_options=pa_csv.ConvertOptions(
+                            column_types=text_columns,
+                            strings_can_be_null=True,
+                            quoted_strings_can_be_null=False
+                        ))
+            except Exception:
+                # Leave the connection usable for the next extraction
+                connection.rollback()
+                raise
+        
+        df = table.to_pandas()
+        self._store_cached_frame(cache_path, df)
+        return df
     
-    def extract_standard_terms(self) -> pd.DataFrame:
-        """Extract standard-term mappings from v1.3.0 schema"""
-        query = """
-        SELECT 
-            st.st_id,
-            st.standard_id,
-            st.term_id,
-            st.relation_type,
-            st.method,
-            st.confidence,
-            s.standard_code,
-            ts.term_name,
-            ts.term_type
-        FROM curriculum.standard_terms st
-        JOIN curriculum.achievement_standards s ON st.standard_id = s.standard_id
-        JOIN curriculum.terms_symbols ts ON st.term_id = ts.term_id
-        ORDER BY s.standard_code, ts.term_name
-        """
+    def _cached_frames(self, queries: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """Cached extractions for whichever of the queries have one"""
+        frames = {}
+        for key, query in queries.items():
+            cached = self._load_cached_frame(self._cache_path(query))
+            if cached is not None:
+                frames[key] = cached
+        return frames
+    
+    def _read_frames(self, queries: Dict[str, str], connection=None) -> Dict[str, pd.DataFrame]:
+        """Run several SELECTs in one round trip, each aggregated to a JSON array under its key"""
+        cache_paths = {key: self._cache_path(query) for key, query in queries.items()}
+        frames = self._cached_frames(queries)
+        
+        missing = {key: query for key, query in queries.items() if key not in frames}
+        if missing:
+            fused_query = "\nUNION ALL\n".join(
+                f"SELECT %s AS tag, (SELECT json_agg(q) FROM ({query}) AS q) AS rows"
+                for query in missing.values()
+            )
+            
+            with self._borrowed_connection(connection) as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(fused_query, list(missing))
+                        results = dict(cursor.fetchall())
+                except Exception:
+                    connection.rollback()
+                    raise
+            
+            for key in missing:
+                df = pd.DataFrame.from_records(results.get(key) or [])
+                frames[key] = df.astype({
+                    column: 'category' for column in LOW_CARDINALITY_COLUMNS.intersection(df.columns)
+                })
+                self._store_cached_frame(cache_paths[key], frames[key])
         
+        return {key: frames[key] for key in queries}
+    
+    def _extract(self, query: str, label: str, connection=None, required: bool = True) -> pd.DataFrame:
+        """Timed extraction of one query; optional ones return an empty frame on failure"""
+        start = time.perf_counter()
         try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} standard-term mappings")
-            return df
+            df = self._read_frame(query, connection)
         except Exception as e:
-            logger.warning(f"No standard-term mappings found or table doesn't exist: {e}")
-            return pd.DataFrame()
+            if not required:
+                logger.warning(f"Could not extract {label}: {e}")
+                return pd.DataFrame()
+            logger.error(f"Failed to extract {label}: {e}")
+            raise
+        # Brace arguments are only formatted when INFO is enabled
+        logger.info("Extracted {} {} in {:.3f}s", len(df), label, time.perf_counter() - start)
+        return df
     
-    def extract_competencies(self) -> pd.DataFrame:
+    def extract_achievement_standards(self, connection=None) -> pd.DataFrame:
+        """Extract all achievement standards"""
+        return self._extract(ACHIEVEMENT_STANDARDS_QUERY, 'achievement standards', connection)
+    
+    def extract_achievement_levels(self, connection=None) -> pd.DataFrame:
+        """Extract all achievement levels"""
+        return self._extract(ACHIEVEMENT_LEVELS_QUERY, 'achievement levels', connection)
+    
+    def extract_content_elements(self, connection=None) -> pd.DataFrame:
+        """Extract content elements"""
+        return self._extract(CONTENT_ELEMENTS_QUERY, 'content elements', connection)
+    
+    def extract_terms_symbols(self, connection=None) -> pd.DataFrame:
+        """Extract terms and symbols"""
+        return self._extract(TERMS_SYMBOLS_QUERY, 'terms and symbols', connection)
+    
+    def extract_standard_relations(self, connection=None) -> pd.DataFrame:
+        """Extract achievement standard relations from v1.3.0 schema (endpoint codes only, no content)"""
+        return self._extract(STANDARD_RELATIONS_QUERY, 'standard relations', connection, required=False)
+    
+    def extract_standard_terms(self, connection=None) -> pd.DataFrame:
+        """Extract standard-term mappings from v1.3.0 schema"""
+        return self._extract(STANDARD_TERMS_QUERY, 'standard-term mappings', connection, required=False)
+    
+    def extract_competencies(self, connection=None) -> pd.DataFrame:
         """Extract competencies and standard mappings from v1.3.0 schema"""
-        query = """
-        SELECT 
-            c.comp_id,
-            c.comp_code,
-            c.comp_name,
-            c.description
-        FROM curriculum.competencies c
-        ORDER BY c.comp_code
-        """
-        
-        try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} competencies")
-            return df
-        except Exception as e:
-            logger.warning(f"No competencies found or table doesn't exist: {e}")
-            return pd.DataFrame()
+        return self._extract(COMPETENCIES_QUERY, 'competencies', connection, required=False)
     
-    def extract_prerequisite_suggestions(self) -> pd.DataFrame:
+    def extract_prerequisite_suggestions(self, connection=None) -> pd.DataFrame:
         """Extract prerequisite suggestions from v1.3.0 view"""
-        query = """
-        SELECT 
-            src_standard_id,
-            dst_standard_id,
-            relation_type,
-            rationale,
-            method,
-            confidence
-        FROM curriculum.v_prerequisite_suggestions
-        ORDER BY confidence DESC
-        """
-        
-        try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} prerequisite suggestions")
-            return df
-        except Exception as e:
-            logger.warning(f"Could not extract prerequisite suggestions: {e}")
-            return pd.DataFrame()
+        return self._extract(PREREQUISITE_SUGGESTIONS_QUERY, 'prerequisite suggestions', connection, required=False)
     
-    def extract_horizontal_suggestions(self) -> pd.DataFrame:
+    def extract_horizontal_suggestions(self, connection=None) -> pd.DataFrame:
         """Extract horizontal suggestions from v1.3.0 view"""
-        query = """
-        SELECT 
-            src_standard_id,
-            dst_standard_id,
-            relation_type,
-            rationale,
-            method,
-            confidence
-        FROM curriculum.v_horizontal_suggestions
-        ORDER BY confidence DESC
-        """
-        
-        try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} horizontal suggestions")
-            return df
-        except Exception as e:
-            logger.warning(f"Could not extract horizontal suggestions: {e}")
-            return pd.DataFrame()
+        return self._extract(HORIZONTAL_SUGGESTIONS_QUERY, 'horizontal suggestions', connection, required=False)
     
-    def extract_representation_types(self) -> pd.DataFrame:
+    def extract_representation_types(self, connection=None) -> pd.DataFrame:
         """Extract representation types from v1.3.0 schema"""
-        query = """
-        SELECT 
-            rep_type_id,
-            type_name,
-            description
-        FROM curriculum.representation_types
-        ORDER BY rep_type_id
-        """
+        return self._extract(REPRESENTATION_TYPES_QUERY, 'representation types', connection, required=False)
+    
+    def extract_document_corpus(self, connection=None) -> List[Dict[str, Any]]:
+        """Build the document corpus in Postgres, in the shape prepare_document_corpus returns"""
+        with self._borrowed_connection(connection) as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(DOCUMENT_CORPUS_QUERY)
+                    standards, levels = cursor.fetchone()
+            except Exception as e:
+                connection.rollback()
+                logger.error(f"Failed to extract document corpus: {e}")
+                raise
         
+        documents = (standards or []) + (levels or [])
+        logger.info(f"Prepared {len(documents)} documents for processing")
+        return documents
+    
+    def extract_distribution_stats(self, connection=None) -> Dict[str, pd.Series]:
+        """Count standards per domain_name and grade_range without fetching the standards"""
         try:
-            df = pd.read_sql_query(query, self._connection)
-            logger.info(f"Extracted {len(df)} representation types")
-            return df
+            df = self._read_frame(DISTRIBUTION_STATS_QUERY, connection)
         except Exception as e:
-            logger.warning(f"Could not extract representation types: {e}")
-            return pd.DataFrame()
+            logger.error(f"Failed to extract distribution stats: {e}")
+            raise
+        
+        # Shaped like value_counts() on the standards column, so contexts render identically
+        return {
+            dimension: group.set_index('label')['count'].rename_axis(dimension)
+            for dimension, group in df.groupby('dimension', sort=False)
+        }
     
-    def check_cycles(self) -> pd.DataFrame:
+    def check_cycles(self, connection=None) -> pd.DataFrame:
         """Check for cycles using v1.3.0 function"""
         query = "SELECT * FROM curriculum.detect_prerequisite_cycles()"
         
         try:
-            df = pd.read_sql_query(query, self._connection)
+            df = self._read_frame(query, connection, use_cache=False)
             if len(df) > 0:
                 logger.warning(f"Found {len(df)} cycles in prerequisite relationships")
             else:
@@ -306,41 +554,111 @@ class DatabaseManager:
     
     def extract_all_curriculum_data(self) -> Dict[str, pd.DataFrame]:
         """Extract all curriculum data including v1.3.0 tables"""
-        self.connect()
+        # Per-table fallbacks for schemas missing a v1.3.0 table, each on its own pooled connection
+        optional_jobs = {
+            # v1.3.0 tables
+            'standard_relations': self.extract_standard_relations,
+            'standard_terms': self.extract_standard_terms,
+            'competencies': self.extract_competencies,
+            # v1.3.0 views for suggestions
+            'prerequisite_suggestions': self.extract_prerequisite_suggestions,
+            'horizontal_suggestions': self.extract_horizontal_suggestions,
+            'representation_types': self.extract_representation_types
+        }
+        queries = {key: query for key, (query, _) in {**CORE_QUERIES, **OPTIONAL_QUERIES}.items()}
         
-        try:
-            data = {
-                'achievement_standards': self.extract_achievement_standards(),
-                'achievement_levels': self.extract_achievement_levels(),
-                'content_elements': self.extract_content_elements(),
-                'terms_symbols': self.extract_terms_symbols(),
-                # v1.3.0 tables
-                'standard_relations': self.extract_standard_relations(),
-                'standard_terms': self.extract_standard_terms(),
-                'competencies': self.extract_competencies(),
-                # v1.3.0 views for suggestions
-                'prerequisite_suggestions': self.extract_prerequisite_suggestions(),
-                'horizontal_suggestions': self.extract_horizontal_suggestions(),
-                'representation_types': self.extract_representation_types()
-            }
+        # A warm extraction cache serves every table without opening the pool
+        data = self._cached_frames(queries)
+        if len(data) == len(queries):
+            logger.info("Loaded all curriculum tables from the extraction cache")
+        else:
+            pool = self._get_pool()
             
-            logger.info("Successfully extracted all curriculum data")
-            return data
+            def run(job):
+                connection = pool.getconn()
+                try:
+                    return job(connection=connection)
+                finally:
+                    pool.putconn(connection)
             
-        finally:
-            self.disconnect()
+            try:
+                # Every table in one round trip on one connection, when the schema has them all
+                data = run(lambda connection: self._read_frames(queries, connection))
+                for key, (_, label) in OPTIONAL_QUERIES.items():
+                    logger.info(f"Extracted {len(data[key])} {label}")
+            except psycopg2.Error as e:
+                logger.warning(f"Bundled extraction failed, extracting tables separately: {e}")
+                
+                # No more workers than pooled connections, or getconn() raises PoolError
+                with ThreadPoolExecutor(max_workers=min(self.pool_size, len(optional_jobs) + 1)) as executor:
+                    # Core tables in a single round trip
+                    core = executor.submit(run, lambda connection: self._read_frames(
+                        {key: query for key, (query, _) in CORE_QUERIES.items()}, connection
+                    ))
+                    futures = {key: executor.submit(run, job) for key, job in optional_jobs.items()}
+                    
+                    try:
+                        data = core.result()
+                    except Exception as e:
+                        logger.error(f"Failed to extract core curriculum tables: {e}")
+                        raise
+                    
+                    data.update({key: future.result() for key, future in futures.items()})
+        
+        for key, (_, label) in CORE_QUERIES.items():
+            logger.info(f"Extracted {len(data[key])} {label}")
+        
+        # Index by standard_id (kept as a column too) so .loc lookups are hashed
+        # or binary-searched instead of scanning every row
+        for key in ('achievement_standards', 'achievement_levels'):
+            if 'standard_id' in data[key].columns:
+                data[key] = data[key].set_index('standard_id', drop=False).rename_axis(None)
+        
+        # Relation endpoints' and levels' parent text comes from the standards already
+        # in memory, not the wire
+        relations, standards = data['standard_relations'], data['achievement_standards']
+        levels = data['achievement_levels']
+        if {'standard_id', 'standard_content'} <= set(standards.columns):
+            content = standards['standard_content']
+            if 'src_standard_id' in relations.columns:
+                relations['src_content'] = relations['src_standard_id'].map(content)
+                relations['dst_content'] = relations['dst_standard_id'].map(content)
+            if 'standard_id' in levels.columns:
+                levels['standard_content'] = levels['standard_id'].map(content)
+        
+        logger.info("Successfully extracted all curriculum data")
+        return data
+
+def _iter_records(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Row dicts of df, built DOCUMENT_SLICE_ROWS at a time so only one slice is held at once"""
+    for start in range(0, len(df), DOCUMENT_SLICE_ROWS):
+        yield from df.iloc[start:start + DOCUMENT_SLICE_ROWS].to_dict('records')
 
 class CurriculumDataProcessor:
     """Process and prepare curriculum data for AI models"""
     
     @staticmethod
-    def prepare_document_corpus(data: Dict[str, pd.DataFrame]) -> List[Dict[str, Any]]:
-        """Prepare document corpus for embedding and analysis"""
-        documents = []
+    def prepare_document_corpus(data: Dict[str, pd.DataFrame],
+                                db_manager: Optional[DatabaseManager] = None) -> List[Dict[str, Any]]:
+        """Prepare document corpus for embedding and analysis, in SQL when a db_manager is given"""
+        if db_manager is not None:
+            return db_manager.extract_document_corpus()
+        
+        documents = list(CurriculumDataProcessor.iter_document_corpus(data))
+        
+        logger.info(f"Prepared {len(documents)} documents for processing")
+        return documents
+    
+    @staticmethod
+    def iter_document_corpus(data: Dict[str, pd.DataFrame]) -> Iterator[Dict[str, Any]]:
+        """Yield corpus documents one at a time, standards first, converting rows in slices"""
+        # filter drops the joined columns documents never read, leaving absent ones to .get
+        standards = data['achievement_standards'].filter(items=STANDARD_DOCUMENT_COLUMNS)
+        levels = data['achievement_levels'].filter(items=LEVEL_DOCUMENT_COLUMNS)
         
-        # Achievement Standards
-        for _, row in data['achievement_standards'].iterrows():
-            doc = {
+        # Achievement Standards (to_dict('records') avoids boxing each row into a Series)
+        for row in _iter_records(standards):
+            yield {
                 'id': f"standard_{row['standard_id']}",
                 'type': 'achievement_standard',
                 'code': row['standard_code'],
@@ -356,11 +674,10 @@ class CurriculumDataProcessor:
                     'element_name': row.get('element_name')
                 }
             }
-            documents.append(doc)
         
         # Achievement Levels
-        for _, row in data['achievement_levels'].iterrows():
-            doc = {
+        for row in _iter_records(levels):
+            yield {
                 'id': f"level_{row['achievement_level_id']}",
                 'type': 'achievement_level',
                 'standard_code': row['standard_code'],
@@ -371,14 +688,76 @@ class CurriculumDataProcessor:
                     'parent_standard': row['standard_content']
                 }
             }
-            documents.append(doc)
+    
+    @staticmethod
+    def prepare_document_table(data: Dict[str, pd.DataFrame]) -> pa.Table:
+        """Prepare the document corpus as a columnar Arrow table, one row per document"""
+        standards = data['achievement_standards']
+        levels = data['achievement_levels']
         
-        logger.info(f"Prepared {len(documents)} documents for processing")
-        return documents
+        def column(df: pd.DataFrame, name: str):
+            return df[name] if name in df.columns else None
+        
+        standard_ids = column(standards, 'standard_id')
+        level_ids = column(levels, 'achievement_level_id')
+        
+        table = pa.concat_tables([
+            CurriculumDataProcessor._document_table(len(standards), {
+                'id': 'standard_' + standard_ids.astype(str) if standard_ids is not None else None,
+                'type': 'achievement_standard',
+                'code': column(standards, 'standard_code'),
+                'title': column(standards, 'standard_title'),
+                'content': column(standards, 'standard_content'),
+                'domain': column(standards, 'domain_name'),
+                'school_type': column(standards, 'school_type'),
+                'grade_range': column(standards, 'grade_range'),
+                'standard_id': standard_ids
+            }),
+            CurriculumDataProcessor._document_table(len(levels), {
+                'id': 'level_' + level_ids.astype(str) if level_ids is not None else None,
+                'type': 'achievement_level',
+                'code': column(levels, 'standard_code'),
+                'content': column(levels, 'level_description'),
+                'level_code': column(levels, 'level_code'),
+                'standard_id': column(levels, 'standard_id')
+            })
+        ]).unify_dictionaries()
+        
+        logger.info(f"Prepared {table.num_rows} documents for processing")
+        return table
+    
+    @staticmethod
+    def save_document_table(table: pa.Table, path: str):
+        """Write the Arrow document corpus as LZ4-compressed Feather for other processes to load"""
+        feather.write_feather(table, path, compression='lz4')
+        logger.info(f"Saved {table.num_rows} documents to {path}")
+    
+    @staticmethod
+    def load_document_table(path: str) -> pa.Table:
+        """Load a saved document corpus; buffers come from a memory map rather than a full read"""
+        return feather.read_table(path, memory_map=True)
+    
+    @staticmethod
+    def _document_table(num_rows: int, columns: Dict[str, Any]) -> pa.Table:
+        """Build one DOCUMENT_TABLE_SCHEMA table; missing columns become nulls, str values are repeated"""
+        arrays = []
+        for field in DOCUMENT_TABLE_SCHEMA:
+            values = columns.get(field.name)
+            value_type = pa.string() if pa.types.is_dictionary(field.type) else field.type
+            if values is None:
+                array = pa.nulls(num_rows, value_type)
+            elif isinstance(values, str):
+                array = pa.array([values] * num_rows, value_type)
+            else:
+                array = pa.array(values, value_type, from_pandas=True)
+            arrays.append(array.dictionary_encode() if pa.types.is_dictionary(field.type) else array)
+        return pa.Table.from_arrays(arrays, schema=DOCUMENT_TABLE_SCHEMA)
     
     @staticmethod
-    def create_context_for_ai(data: Dict[str, pd.DataFrame]) -> str:
-        """Create comprehensive context for AI models"""
+    def create_context_for_ai(data: Dict[str, pd.DataFrame],
+                              distributions: Optional[Dict[str, pd.Series]] = None) -> str:
+        """Create comprehensive context for AI models, using extract_distribution_stats counts if given"""
+        distributions = distributions or {}
         
         # Count statistics
         stats = {
@@ -389,15 +768,19 @@ class CurriculumDataProcessor:
         }
         
         # Domain distribution (handle missing column)
-        if 'domain_name' in data['achievement_standards'].columns:
+        domain_dist = distributions.get('domain_name')
+        if domain_dist is None and 'domain_name' in data['achievement_standards'].columns:
             domain_dist = data['achievement_standards']['domain_name'].value_counts()
+        if domain_dist is not None:
             domain_section = f"=== 영역별 분포 ===\n{domain_dist.to_string()}"
         else:
             domain_section = "=== 영역별 분포 ===\n(영역 정보 없음)"
         
         # Grade level distribution (handle missing column)
-        if 'grade_range' in data['achievement_standards'].columns:
+        grade_dist = distributions.get('grade_range')
+        if grade_dist is None and 'grade_range' in data['achievement_standards'].columns:
             grade_dist = data['achievement_standards']['grade_range'].value_counts()
+        if grade_dist is not None:
             grade_section = f"=== 학년군별 분포 ===\n{grade_dist.to_string()}"
         else:
             grade_section = "=== 학년군별 분포 ===\n(학년 정보 없음)"
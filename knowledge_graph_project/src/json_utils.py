@@ -0,0 +1,32 @@
+"""
+JSON parsing helpers for model responses, shared by every phase
+"""
+import re
+from typing import Any, Dict
+
+import orjson
+
+# Fallback extraction for responses that wrap the JSON object in prose or a code fence
+JSON_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.DOTALL)
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
+
+def extract_json(content: str) -> Dict[str, Any]:
+    """Parse the JSON object in a model response"""
+    # JSON-mode responses are the object itself
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+
+    # Try to find JSON in code block first, then the outermost braces
+    match = JSON_CODE_BLOCK_RE.search(content) or JSON_OBJECT_RE.search(content)
+    if not match:
+        raise ValueError("No JSON object in response")
+    json_str = match.group(match.lastindex or 0)
+
+    # Clean up common issues: raw line breaks and trailing commas
+    json_str = json_str.replace('\n', ' ').replace('\r', ' ')
+    json_str = TRAILING_COMMA_RE.sub(r'\1', json_str)
+    return orjson.loads(json_str)
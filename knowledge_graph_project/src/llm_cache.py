@@ -0,0 +1,109 @@
+"""
+On-disk cache for deterministic LLM responses
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+from loguru import logger
+
+
+class LLMCache:
+    """SQLite-backed response cache keyed by a hash of the request"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int, **kwargs) -> str:
+        """Hash the request parameters that determine the response"""
+        # Stays on stdlib json: a different encoding would change every key and orphan the cache
+        payload = json.dumps(
+            {
+                'model': model,
+                'prompt': prompt,
+                'temperature': temperature,
+                'max_tokens': max_tokens,
+                'kwargs': kwargs
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL)"
+            )
+            self._connection.commit()
+        return self._connection
+    
+    def _get_sync(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        # Older rows hold JSON text, newer ones orjson bytes; orjson.loads reads both
+        return orjson.loads(row[0])
+    
+    def _set_sync(self, key: str, response: Dict[str, Any], ttl: Optional[float]):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, orjson.dumps(response), now, now + ttl if ttl else None)
+            )
+            connection.commit()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss"""
+        try:
+            response = await asyncio.to_thread(self._get_sync, key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            response = None
+        
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+    
+    async def set(self, key: str, response: Dict[str, Any], ttl: Optional[float] = None):
+        """Store a response, optionally expiring after ttl seconds"""
+        try:
+            await asyncio.to_thread(self._set_sync, key, response, ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
+    
+    def close(self):
+        """Close the cache database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
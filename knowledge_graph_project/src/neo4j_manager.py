@@ -1,263 +1,498 @@
 """
 Neo4j Graph Database Manager
 """
-from neo4j import GraphDatabase
-from typing import Dict, List, Any, Optional
+import atexit
+import csv
+import math
+import subprocess
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from neo4j import READ_ACCESS, AsyncGraphDatabase, AsyncResult, GraphDatabase, RoutingControl
+from neo4j.exceptions import ClientError
+from typing import Dict, List, Any, Iterator, Optional
 import json
+import pandas as pd
 from loguru import logger
 from config.settings import config
 
+# Rows per write transaction when batching relationships with UNWIND
+RELATIONSHIP_BATCH_SIZE = 10000
+
+# Rows per UNWIND statement when creating nodes, which bounds each Bolt message
+NODE_BATCH_SIZE = 10000
+
+# Nodes deleted per inner transaction when clearing the database, so the
+# transaction state stays bounded however large the graph is
+CLEAR_BATCH_SIZE = 10000
+CLEAR_DATABASE_QUERY = f"""
+    MATCH (n)
+    CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {CLEAR_BATCH_SIZE} ROWS
+"""
+
+# Concurrent writer sessions for educational relationships, capped by the driver pool size
+RELATIONSHIP_WORKERS = 8
+
+GRADE_LEVELS = [
+    {"code": "ELEM_1_2", "name": "초등 1-2학년군", "grade_start": 1, "grade_end": 2},
+    {"code": "ELEM_3_4", "name": "초등 3-4학년군", "grade_start": 3, "grade_end": 4},
+    {"code": "ELEM_5_6", "name": "초등 5-6학년군", "grade_start": 5, "grade_end": 6},
+    {"code": "MIDDLE", "name": "중학교 1-3학년군", "grade_start": 7, "grade_end": 9}
+]
+
+DOMAINS = [
+    {"code": "NUMBER_OPERATION", "name": "수와 연산"},
+    {"code": "CHANGE_RELATION", "name": "변화와 관계"},
+    {"code": "GEOMETRY_MEASUREMENT", "name": "도형과 측정"},
+    {"code": "DATA_POSSIBILITY", "name": "자료와 가능성"}
+]
+
+# Grade range fragments and domain names mapped to node codes
+GRADE_CODES = {
+    '1-2': 'ELEM_1_2',
+    '3-4': 'ELEM_3_4',
+    '5-6': 'ELEM_5_6',
+    '1-3': 'MIDDLE'
+}
+DOMAIN_CODES = {
+    '수와 연산': 'NUMBER_OPERATION',
+    '변화와 관계': 'CHANGE_RELATION',
+    '도형과 측정': 'GEOMETRY_MEASUREMENT',
+    '자료와 가능성': 'DATA_POSSIBILITY'
+}
+
+# AI relation types mapped to Neo4j relationship names
+RELATION_TYPE_MAP = {
+    'prerequisite': 'PREREQUISITE',
+    'prerequisite_explicit': 'PREREQUISITE',
+    'prerequisite_implicit': 'WEAK_PREREQUISITE',
+    'similar_to': 'SIMILAR_TO',
+    'similar_conceptual': 'CONCEPTUALLY_SIMILAR',
+    'similar_procedural': 'PROCEDURALLY_SIMILAR',
+    'domain_bridge': 'BRIDGES_DOMAIN',
+    'grade_progression': 'PROGRESSES_TO',
+    'corequisite': 'COREQUISITE',
+    'extends': 'EXTENDS',
+    'applies_to': 'APPLIES_TO'
+}
+DEFAULT_RELATION_TYPE = 'RELATED_TO'
+
+# Relationship types cannot be Cypher parameters, so each type gets one fixed
+# statement built at import; identical strings keep hitting the server's plan cache.
+# MERGE on (source, target, relation_type) makes a reload update weights in place.
+EDUCATIONAL_RELATIONSHIP_QUERIES = {
+    neo4j_relation: f"""
+        UNWIND $rows AS r
+        MATCH (s1:AchievementStandard {{code: r.source_code}}),
+              (s2:AchievementStandard {{code: r.target_code}})
+        MERGE (s1)-[rel:{neo4j_relation} {{relation_type: r.relation_type}}]->(s2)
+        SET rel.weight = r.weight, rel.reasoning = r.reasoning
+    """
+    for neo4j_relation in {*RELATION_TYPE_MAP.values(), DEFAULT_RELATION_TYPE}
+}
+
+# Hierarchical links from (start code, end code) pairs computed in Python; each side
+# is a constraint-index seek instead of a label-scan cross product, and MERGE keeps
+# a rerun from duplicating them
+HIERARCHICAL_RELATIONSHIP_QUERIES = {
+    # Grade -> Domain relationships
+    'has_domain': """
+        UNWIND $pairs AS p
+        MATCH (g:GradeLevel {code: p.start})
+        MATCH (d:Domain {code: p.end})
+        MERGE (g)-[:HAS_DOMAIN]->(d)
+    """,
+    # Domain -> Standard relationships
+    'domain_contains_standard': """
+        UNWIND $pairs AS p
+        MATCH (d:Domain {code: p.start})
+        MATCH (s:AchievementStandard {code: p.end})
+        MERGE (d)-[:CONTAINS_STANDARD]->(s)
+    """,
+    # Grade -> Standard relationships
+    'grade_contains_standard': """
+        UNWIND $pairs AS p
+        MATCH (g:GradeLevel {code: p.start})
+        MATCH (s:AchievementStandard {code: p.end})
+        MERGE (g)-[:CONTAINS_STANDARD]->(s)
+    """,
+    # Standard -> Level relationships
+    'has_level': """
+        UNWIND $pairs AS p
+        MATCH (s:AchievementStandard {code: p.start})
+        MATCH (l:AchievementLevel {id: p.end})
+        MERGE (s)-[:HAS_LEVEL]->(l)
+    """
+}
+
+CONSTRAINT_QUERIES = (
+    "CREATE CONSTRAINT standard_code_unique IF NOT EXISTS FOR (s:AchievementStandard) REQUIRE s.code IS UNIQUE",
+    "CREATE CONSTRAINT level_id_unique IF NOT EXISTS FOR (l:AchievementLevel) REQUIRE l.id IS UNIQUE",
+    "CREATE CONSTRAINT grade_code_unique IF NOT EXISTS FOR (g:GradeLevel) REQUIRE g.code IS UNIQUE",
+    "CREATE CONSTRAINT domain_code_unique IF NOT EXISTS FOR (d:Domain) REQUIRE d.code IS UNIQUE"
+)
+LEGACY_INDEX_DROPS = tuple(
+    f"DROP INDEX {index} IF EXISTS"
+    for index in ("standard_code_idx", "level_id_idx", "grade_code_idx", "domain_code_idx")
+)
+
+# Standard row keys that only locate the grade/domain parents; the hierarchy is
+# stored as CONTAINS_STANDARD edges, so they are not written as node properties
+STANDARD_LINK_KEYS = ('grade_code', 'domain_code')
+
+# Node creation, MERGEd on each label's uniqueness-constrained key so rerunning
+# create_knowledge_graph updates the nodes in place. Difficulty and the level id
+# arrive in the rows rather than being derived in Cypher: the neo4j-admin CSV export
+# and the HAS_LEVEL pairs need them client-side anyway, so _standard_frame and
+# _level_rows stay their single source
+STANDARD_NODE_QUERY = "UNWIND $rows AS row MERGE (s:AchievementStandard {code: row.code}) SET s = row"
+LEVEL_NODE_QUERY = "UNWIND $rows AS row MERGE (l:AchievementLevel {id: row.id}) SET l = row"
+
+# Per-label and per-type counts read from the store's counters in constant time
+META_STATS_QUERY = "CALL apoc.meta.stats() YIELD labels, relTypesCount RETURN labels, relTypesCount"
+PROCEDURE_NOT_FOUND = "Neo.ClientError.Procedure.ProcedureNotFound"
+
+# Without APOC: the same counts from one node pass and one relationship pass; totals
+# and density are derived from these in Python rather than by scanning the graph again
+GRAPH_STATISTICS_QUERY = """
+    CALL {
+        MATCH (n)
+        WITH labels(n)[0] AS label, count(n) AS count
+        RETURN collect({label: label, count: count}) AS node_stats
+    }
+    CALL {
+        MATCH ()-[r]->()
+        WITH type(r) AS relationship, count(r) AS count
+        RETURN collect({relationship: relationship, count: count}) AS rel_stats
+    }
+    RETURN node_stats, rel_stats
+"""
+
+SIMILAR_STANDARDS_QUERY = """
+    MATCH (s1:AchievementStandard {code: $code})-[r:SIMILAR_TO|CONCEPTUALLY_SIMILAR|PROCEDURALLY_SIMILAR]-(s2:AchievementStandard)
+    RETURN s2.code as code, s2.content as content, r.weight as similarity, type(r) as relation_type
+    ORDER BY r.weight DESC
+    LIMIT $limit
+"""
+
+# DISTINCT endpoints let the planner use a pruning expand (one visit per node)
+# instead of enumerating every path, which grows exponentially on dense subgraphs
+PREREQUISITE_CHAIN_QUERY = """
+    MATCH (end:AchievementStandard {code: $code})
+    MATCH (start:AchievementStandard)-[:PREREQUISITE*1..5]->(end)
+    WITH DISTINCT start, end
+    MATCH path = shortestPath((start)-[:PREREQUISITE*1..5]->(end))
+    RETURN [node in nodes(path) | {code: node.code, content: node.content}] as chain,
+           length(path) as chain_length
+    ORDER BY chain_length
+    LIMIT $limit
+"""
+
+# Both ends are looked up by code, which the planner seeks through the uniqueness
+# constraints when they exist; no USING INDEX hints, because a hinted index that is
+# missing (as after bulk_import, which creates no constraints) is an error, not a scan
+LEARNING_PATHWAY_QUERY = """
+    MATCH (g:GradeLevel {code: $grade_code})-[:CONTAINS_STANDARD]->(s:AchievementStandard)
+          <-[:CONTAINS_STANDARD]-(d:Domain {code: $domain_code})
+    OPTIONAL MATCH (s)-[r:PREREQUISITE]->(next:AchievementStandard)
+    RETURN s.code as code, s.content as content, s.difficulty as difficulty,
+           collect({next_code: next.code, weight: r.weight}) as next_steps
+    ORDER BY s.difficulty
+"""
+
+# Seconds a read stays servable inside a cached_reads() block; other processes
+# may write to the graph, so nothing is cached beyond that or outside a block
+READ_CACHE_TTL = 60
+
+# Seconds before a pooled connection is retired and reopened
+NEO4J_MAX_CONNECTION_LIFETIME = 1800
+
+class _ReadCache:
+    """Complete read results keyed on (query, parameters), each expiring ttl seconds after it was read"""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+    
+    @staticmethod
+    def key(query: str, params: Dict[str, Any]) -> tuple:
+        return query, tuple(sorted(params.items()))
+    
+    def get(self, key: tuple) -> Optional[List[Dict]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, rows = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        # Copies keep callers from mutating the cached rows
+        return [dict(row) for row in rows]
+    
+    def put(self, key: tuple, rows: List[Dict]):
+        """Keep rows, which the caller must not hand out uncopied"""
+        self._entries[key] = (time.monotonic() + self.ttl, rows)
+    
+    def clear(self):
+        self._entries.clear()
+
+
 class Neo4jManager:
     """Manages Neo4j graph database operations"""
     
+    # One driver per process: drivers pool their connections and are meant to be long-lived
+    _driver = None
+    
+    # Cleared the first time apoc.meta.stats turns out not to be installed
+    _apoc_available = True
+    
     def __init__(self):
         self.uri = config.database.neo4j_uri
         self.user = config.database.neo4j_user
         self.password = config.database.neo4j_password
         self.driver = None
+        # Set only inside cached_reads()
+        self._read_cache = None
+    
+    @classmethod
+    def get_driver(cls):
+        """Shared driver, created on first use and closed at interpreter exit"""
+        if cls._driver is None:
+            cls._driver = GraphDatabase.driver(
+                config.database.neo4j_uri,
+                auth=(config.database.neo4j_user, config.database.neo4j_password),
+                max_connection_pool_size=config.database.neo4j_max_pool_size,
+                connection_acquisition_timeout=config.database.neo4j_acquisition_timeout,
+                connection_timeout=config.database.neo4j_connection_timeout,
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                keep_alive=True
+            )
+            atexit.register(cls.close_driver)
+        return cls._driver
+    
+    @classmethod
+    def close_driver(cls):
+        """Close the shared driver, if one was created"""
+        if cls._driver is not None:
+            cls._driver.close()
+            cls._driver = None
+            logger.info("Neo4j connection closed")
+    
+    @contextmanager
+    def cached_reads(self, ttl: float = READ_CACHE_TTL):
+        """Serve repeated query_* calls from memory within this block, each result for at most ttl seconds"""
+        previous, self._read_cache = self._read_cache, _ReadCache(ttl)
+        try:
+            yield self
+        finally:
+            self._read_cache = previous
+    
+    def _invalidate_reads(self):
+        """Drop cached reads after this manager changes the graph"""
+        if self._read_cache is not None:
+            self._read_cache.clear()
     
     def connect(self):
         """Establish connection to Neo4j"""
         try:
-            self.driver = GraphDatabase.driver(
-                self.uri, 
-                auth=(self.user, self.password)
-            )
+            self.driver = self.get_driver()
+            # The driver connects lazily; fail here rather than on the first query
+            self.driver.verify_connectivity()
             logger.info("Connected to Neo4j database")
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
             raise
     
     def close(self):
-        """Close Neo4j connection"""
-        if self.driver:
-            self.driver.close()
-            logger.info("Neo4j connection closed")
+        """Release this manager's use of the shared driver, which stays open for reuse"""
+        self.driver = None
     
     def clear_database(self):
         """Clear all data in the database"""
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        with self.get_driver().session(database=config.database.neo4j_database) as session:
+            # Must stay an auto-commit query: CALL ... IN TRANSACTIONS commits its own batches
+            session.run(CLEAR_DATABASE_QUERY).consume()
             logger.info("Database cleared")
+        self._invalidate_reads()
     
     def create_knowledge_graph(self, all_results: Dict[str, Any]):
         """Create complete knowledge graph in Neo4j"""
         logger.info("Creating knowledge graph in Neo4j")
         
-        with self.driver.session() as session:
-            # Create nodes
-            self._create_curriculum_nodes(session, all_results)
-            
-            # Create relationships
-            self._create_relationships(session, all_results)
+        with self.get_driver().session(database=config.database.neo4j_database) as session:
+            # Create constraints first; their backing indexes turn the code lookups
+            # in relationship creation into index seeks instead of label scans
+            self._create_constraints(session)
             
-            # Create indexes for performance
-            self._create_indexes(session)
+            # Create nodes; the data is loaded outside the transaction function
+            # so a retried transaction does not query PostgreSQL again
+            curriculum_data = self._load_curriculum_data(all_results)
+            session.execute_write(self._create_curriculum_nodes_tx, curriculum_data)
             
-            # Create constraints
-            self._create_constraints(session)
+            # Create relationships
+            self._create_relationships(session, all_results, curriculum_data)
         
+        self._invalidate_reads()
         logger.info("Knowledge graph created successfully")
     
-    def _create_curriculum_nodes(self, session, all_results: Dict):
-        """Create all curriculum nodes"""
-        logger.info("Creating curriculum nodes")
-        
+    def _load_curriculum_data(self, all_results: Dict) -> Dict:
+        """Curriculum frames from the results, or from PostgreSQL when the results lack them"""
         # Extract curriculum data if available
         curriculum_data = all_results.get('curriculum_data', {})
         if not curriculum_data:
             # Try to load from database if not in results
             try:
                 from src.data_manager import DatabaseManager
-                db_manager = DatabaseManager()
-                curriculum_data = db_manager.extract_all_curriculum_data()
+                with DatabaseManager() as db_manager:
+                    curriculum_data = db_manager.extract_all_curriculum_data()
             except Exception as e:
                 logger.warning(f"Could not load curriculum data: {e}")
+        return curriculum_data
+    
+    def _create_curriculum_nodes_tx(self, tx, curriculum_data: Dict):
+        """Create all curriculum nodes in one write transaction"""
+        logger.info("Creating curriculum nodes")
         
         # Create grade level nodes
-        grade_levels = [
-            {"code": "ELEM_1_2", "name": "초등 1-2학년군", "grade_start": 1, "grade_end": 2},
-            {"code": "ELEM_3_4", "name": "초등 3-4학년군", "grade_start": 3, "grade_end": 4},
-            {"code": "ELEM_5_6", "name": "초등 5-6학년군", "grade_start": 5, "grade_end": 6},
-            {"code": "MIDDLE", "name": "중학교 1-3학년군", "grade_start": 7, "grade_end": 9}
-        ]
-        
-        for grade in grade_levels:
-            session.run("""
-                CREATE (g:GradeLevel {
-                    code: $code,
-                    name: $name,
-                    grade_start: $grade_start,
-                    grade_end: $grade_end
-                })
-            """, **grade)
+        tx.run("UNWIND $rows AS row MERGE (g:GradeLevel {code: row.code}) SET g = row", rows=GRADE_LEVELS)
         
         # Create domain nodes
-        domains = [
-            {"code": "NUMBER_OPERATION", "name": "수와 연산"},
-            {"code": "CHANGE_RELATION", "name": "변화와 관계"},
-            {"code": "GEOMETRY_MEASUREMENT", "name": "도형과 측정"},
-            {"code": "DATA_POSSIBILITY", "name": "자료와 가능성"}
-        ]
-        
-        for domain in domains:
-            session.run("""
-                CREATE (d:Domain {
-                    code: $code,
-                    name: $name
-                })
-            """, **domain)
+        tx.run("UNWIND $rows AS row MERGE (d:Domain {code: row.code}) SET d = row", rows=DOMAINS)
         
         # Create achievement standard nodes from actual data
-        self._create_achievement_standards(session, curriculum_data)
+        self._create_achievement_standards(tx, curriculum_data)
         
         # Create achievement level nodes from actual data
-        self._create_achievement_levels(session, curriculum_data)
+        self._create_achievement_levels(tx, curriculum_data)
     
-    def _create_achievement_standards(self, session, curriculum_data=None):
+    @staticmethod
+    def _standard_frame(curriculum_data) -> pd.DataFrame:
+        """AchievementStandard properties plus the grade/domain link codes, one row per standard"""
+        standards = curriculum_data['achievement_standards']
+        
+        def column(name, default):
+            if name in standards:
+                return standards[name]
+            return pd.Series(default, index=standards.index)
+        
+        # Extracted frames hold these as categoricals; plain strings keep map/fillna simple
+        grade_range = column('grade_range', '').astype(object).fillna('')
+        domain_name = column('domain_name', '').astype(object)
+        
+        # Extract grade code from grade_range; the first matching fragment wins,
+        # so fragments are applied in reverse and earlier ones overwrite later ones
+        grade_code = pd.Series('UNKNOWN', index=standards.index, dtype=object)
+        for key in reversed(list(GRADE_CODES)):
+            grade_code = grade_code.mask(grade_range.str.contains(key, regex=False), GRADE_CODES[key])
+        
+        return pd.DataFrame({
+            'code': column('standard_code', ''),
+            'title': column('standard_title', ''),
+            'content': column('standard_content', ''),
+            'grade_code': grade_code,
+            'grade_range': column('grade_range', ''),
+            # Map domain name to code
+            'domain_code': domain_name.map(DOMAIN_CODES).fillna('UNKNOWN'),
+            'domain_name': column('domain_name', ''),
+            # Estimate difficulty based on standard order; a missing order counts as 3
+            'difficulty': (column('standard_order', 3).fillna(3) // 3 + 1).clip(1, 5).astype(int),
+            'standard_order': column('standard_order', 0),
+            'level_id': column('level_id', 0),
+            'domain_id': column('domain_id', 0)
+        })
+    
+    @classmethod
+    def _standard_rows(cls, curriculum_data) -> List[Dict[str, Any]]:
+        """AchievementStandard properties plus the grade/domain link codes, one dict per standard"""
+        return cls._standard_frame(curriculum_data).to_dict('records')
+    
+    @staticmethod
+    def _level_rows(curriculum_data) -> List[Dict[str, Any]]:
+        """AchievementLevel node properties, one dict per level"""
+        levels = curriculum_data['achievement_levels']
+        
+        def column(name, default):
+            if name in levels:
+                return levels[name]
+            return pd.Series(default, index=levels.index)
+        
+        standard_code = column('standard_code', '').astype(object)
+        level_code = column('level_code', '').astype(object)
+        return pd.DataFrame({
+            # Create unique ID
+            'id': standard_code.astype(str) + '_' + level_code.astype(str),
+            'achievement_level_id': column('achievement_level_id', 0),
+            'standard_code': column('standard_code', ''),
+            'level_code': column('level_code', ''),
+            'level_name': column('level_name', ''),
+            'description': column('level_description', '')
+        }).to_dict('records')
+    
+    def _create_achievement_standards(self, tx, curriculum_data=None):
         """Create achievement standard nodes from actual data"""
         if curriculum_data and 'achievement_standards' in curriculum_data:
-            standards_df = curriculum_data['achievement_standards']
-            
-            # Map grade levels to codes
-            grade_map = {
-                '1-2': 'ELEM_1_2',
-                '3-4': 'ELEM_3_4', 
-                '5-6': 'ELEM_5_6',
-                '1-3': 'MIDDLE'
-            }
-            
-            # Map domains to codes
-            domain_map = {
-                '수와 연산': 'NUMBER_OPERATION',
-                '변화와 관계': 'CHANGE_RELATION',
-                '도형과 측정': 'GEOMETRY_MEASUREMENT',
-                '자료와 가능성': 'DATA_POSSIBILITY'
-            }
+            # UNWIND batches instead of a round trip per standard
+            rows = self._standard_frame(curriculum_data).drop(columns=list(STANDARD_LINK_KEYS)).to_dict('records')
+            self._create_nodes(tx, STANDARD_NODE_QUERY, rows)
             
-            for _, row in standards_df.iterrows():
-                # Extract grade code from grade_range
-                grade_range = row.get('grade_range', '')
-                grade_code = 'UNKNOWN'
-                for key, value in grade_map.items():
-                    if key in grade_range:
-                        grade_code = value
-                        break
-                
-                # Map domain name to code
-                domain_code = domain_map.get(row.get('domain_name', ''), 'UNKNOWN')
-                
-                # Estimate difficulty based on standard order
-                difficulty = min(5, max(1, row.get('standard_order', 3) // 3 + 1))
-                
-                session.run("""
-                    CREATE (s:AchievementStandard {
-                        code: $code,
-                        title: $title,
-                        content: $content,
-                        grade_code: $grade_code,
-                        grade_range: $grade_range,
-                        domain_code: $domain_code,
-                        domain_name: $domain_name,
-                        difficulty: $difficulty,
-                        standard_order: $standard_order,
-                        level_id: $level_id,
-                        domain_id: $domain_id
-                    })
-                """, 
-                    code=row.get('standard_code', ''),
-                    title=row.get('standard_title', ''),
-                    content=row.get('standard_content', ''),
-                    grade_code=grade_code,
-                    grade_range=row.get('grade_range', ''),
-                    domain_code=domain_code,
-                    domain_name=row.get('domain_name', ''),
-                    difficulty=difficulty,
-                    standard_order=row.get('standard_order', 0),
-                    level_id=row.get('level_id', 0),
-                    domain_id=row.get('domain_id', 0)
-                )
-            
-            logger.info(f"Created {len(standards_df)} achievement standard nodes")
+            logger.info(f"Created {len(rows)} achievement standard nodes")
         else:
             logger.warning("No achievement standards data provided, skipping node creation")
     
-    def _create_achievement_levels(self, session, curriculum_data=None):
+    def _create_achievement_levels(self, tx, curriculum_data=None):
         """Create achievement level nodes from actual data"""
         if curriculum_data and 'achievement_levels' in curriculum_data:
-            levels_df = curriculum_data['achievement_levels']
-            
-            for _, row in levels_df.iterrows():
-                # Create unique ID
-                level_id = f"{row.get('standard_code', '')}_{row.get('level_code', '')}"
-                
-                session.run("""
-                    CREATE (l:AchievementLevel {
-                        id: $id,
-                        achievement_level_id: $achievement_level_id,
-                        standard_code: $standard_code,
-                        level_code: $level_code,
-                        level_name: $level_name,
-                        description: $description
-                    })
-                """,
-                    id=level_id,
-                    achievement_level_id=row.get('achievement_level_id', 0),
-                    standard_code=row.get('standard_code', ''),
-                    level_code=row.get('level_code', ''),
-                    level_name=row.get('level_name', ''),
-                    description=row.get('level_description', '')
-                )
+            rows = self._level_rows(curriculum_data)
+            self._create_nodes(tx, LEVEL_NODE_QUERY, rows)
             
-            logger.info(f"Created {len(levels_df)} achievement level nodes")
+            logger.info(f"Created {len(rows)} achievement level nodes")
         else:
             logger.warning("No achievement levels data provided, skipping node creation")
     
-    def _create_relationships(self, session, all_results: Dict):
+    @staticmethod
+    def _create_nodes(tx, query: str, rows: List[Dict[str, Any]]):
+        """Run an UNWIND $rows node query in NODE_BATCH_SIZE slices within the caller's transaction"""
+        for start in range(0, len(rows), NODE_BATCH_SIZE):
+            tx.run(query, rows=rows[start:start + NODE_BATCH_SIZE])
+    
+    def _create_relationships(self, session, all_results: Dict, curriculum_data: Optional[Dict] = None):
         """Create relationships between nodes"""
         logger.info("Creating relationships")
         
         # Create hierarchical relationships
-        self._create_hierarchical_relationships(session)
+        pairs = self._hierarchical_pairs(curriculum_data or {})
+        session.execute_write(self._create_hierarchical_relationships_tx, pairs)
         
         # Create educational relationships from AI analysis
         self._create_educational_relationships(session, all_results)
     
-    def _create_hierarchical_relationships(self, session):
-        """Create hierarchical relationships"""
-        # Grade -> Domain relationships
-        session.run("""
-            MATCH (g:GradeLevel), (d:Domain)
-            CREATE (g)-[:HAS_DOMAIN]->(d)
-        """)
-        
-        # Domain -> Standard relationships
-        session.run("""
-            MATCH (d:Domain), (s:AchievementStandard)
-            WHERE d.code = s.domain_code
-            CREATE (d)-[:CONTAINS_STANDARD]->(s)
-        """)
-        
-        # Grade -> Standard relationships
-        session.run("""
-            MATCH (g:GradeLevel), (s:AchievementStandard)
-            WHERE g.code = s.grade_code
-            CREATE (g)-[:CONTAINS_STANDARD]->(s)
-        """)
-        
-        # Standard -> Level relationships
-        session.run("""
-            MATCH (s:AchievementStandard), (l:AchievementLevel)
-            WHERE s.code = l.standard_code
-            CREATE (s)-[:HAS_LEVEL]->(l)
-        """)
+    def _hierarchical_pairs(self, curriculum_data: Dict) -> Dict[str, List[Dict[str, str]]]:
+        """Start and end codes for each hierarchical relationship, keyed like HIERARCHICAL_RELATIONSHIP_QUERIES"""
+        standards = self._standard_rows(curriculum_data) if 'achievement_standards' in curriculum_data else []
+        levels = self._level_rows(curriculum_data) if 'achievement_levels' in curriculum_data else []
+        return {
+            'has_domain': [{'start': g['code'], 'end': d['code']} for g in GRADE_LEVELS for d in DOMAINS],
+            'domain_contains_standard': [{'start': s['domain_code'], 'end': s['code']} for s in standards],
+            'grade_contains_standard': [{'start': s['grade_code'], 'end': s['code']} for s in standards],
+            'has_level': [{'start': l['standard_code'], 'end': l['id']} for l in levels]
+        }
     
-    def _create_educational_relationships(self, session, all_results: Dict):
-        """Create educational relationships from AI analysis"""
+    def _create_hierarchical_relationships_tx(self, tx, pairs: Dict[str, List[Dict[str, str]]]):
+        """Create hierarchical relationships in one write transaction"""
+        for name, query in HIERARCHICAL_RELATIONSHIP_QUERIES.items():
+            if pairs.get(name):
+                tx.run(query, pairs=pairs[name])
+    
+    def _educational_rows(self, all_results: Dict) -> Dict[str, List[Dict[str, Any]]]:
+        """Relationship properties from refinement results, grouped by Neo4j relationship type"""
         # Extract relationships from refinement results
         refinement_results = all_results.get('refinement_results', {})
         adjusted_weights = refinement_results.get('adjusted_weights', [])
         
+        # Bucket by the AI relation type first so the mapping runs once per type, not per edge
+        rows_by_relation = defaultdict(list)
         for relation in adjusted_weights:
             source_code = relation.get('source_code')
             target_code = relation.get('target_code')
@@ -266,133 +501,342 @@ class Neo4jManager:
             reasoning = relation.get('reasoning', '')
             
             if source_code and target_code and relation_type:
-                # Map relation type to Neo4j relationship
-                neo4j_relation = self._map_relation_type(relation_type)
-                
-                session.run(f"""
-                    MATCH (s1:AchievementStandard {{code: $source_code}}),
-                          (s2:AchievementStandard {{code: $target_code}})
-                    CREATE (s1)-[r:{neo4j_relation} {{
-                        weight: $weight,
-                        reasoning: $reasoning,
-                        relation_type: $relation_type
-                    }}]->(s2)
-                """, source_code=source_code, target_code=target_code, 
-                     weight=weight, reasoning=reasoning, relation_type=relation_type)
+                rows_by_relation[relation_type].append({
+                    'source_code': source_code,
+                    'target_code': target_code,
+                    'weight': weight,
+                    'reasoning': reasoning,
+                    'relation_type': relation_type
+                })
+        
+        # Map relation type to Neo4j relationship
+        rows_by_type = defaultdict(list)
+        for relation_type, rows in rows_by_relation.items():
+            rows_by_type[self._map_relation_type(relation_type)].extend(rows)
+        return rows_by_type
+    
+    def _create_educational_relationships(self, session, all_results: Dict):
+        """Create educational relationships from AI analysis"""
+        # Grouped by Neo4j relationship type so each group runs one precompiled statement
+        rows_by_type = self._educational_rows(all_results)
+        
+        # Shard by source node so two workers rarely lock the same start node, and never
+        # MERGE the same edge concurrently; deadlocks on shared end nodes are retried by execute_write
+        workers = max(1, min(RELATIONSHIP_WORKERS, config.database.neo4j_max_pool_size))
+        shards = [defaultdict(list) for _ in range(workers)]
+        for neo4j_relation, rows in rows_by_type.items():
+            for row in rows:
+                shards[hash(row['source_code']) % workers][neo4j_relation].append(row)
+        shards = [shard for shard in shards if shard]
+        
+        if len(shards) <= 1:
+            for shard in shards:
+                self._write_relationship_shard(session, shard)
+            return
+        
+        # Workers chain on the node-creating session's bookmarks, so on a cluster they
+        # read from a member that has the new nodes instead of MATCHing nothing
+        bookmarks = session.last_bookmarks()
+        
+        def write_shard(shard):
+            # Sessions are not thread safe, so each worker opens its own
+            with self.get_driver().session(database=config.database.neo4j_database,
+                                           bookmarks=bookmarks) as worker_session:
+                self._write_relationship_shard(worker_session, shard)
+        
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            # list() re-raises the first worker failure
+            list(executor.map(write_shard, shards))
+    
+    def _write_relationship_shard(self, session, shard: Dict[str, List[Dict[str, Any]]]):
+        """Write one shard's relationships, a batch per managed transaction"""
+        for neo4j_relation, rows in shard.items():
+            for start in range(0, len(rows), RELATIONSHIP_BATCH_SIZE):
+                session.execute_write(self._run_rows, EDUCATIONAL_RELATIONSHIP_QUERIES[neo4j_relation],
+                                      rows[start:start + RELATIONSHIP_BATCH_SIZE])
+    
+    @staticmethod
+    def _run_rows(tx, query: str, rows: List[Dict[str, Any]]):
+        """Run an UNWIND $rows query inside a managed write transaction"""
+        tx.run(query, rows=rows).consume()
     
     def _map_relation_type(self, relation_type: str) -> str:
         """Map AI relation types to Neo4j relationship names"""
-        mapping = {
-            'prerequisite': 'PREREQUISITE',
-            'prerequisite_explicit': 'PREREQUISITE',
-            'prerequisite_implicit': 'WEAK_PREREQUISITE',
-            'similar_to': 'SIMILAR_TO',
-            'similar_conceptual': 'CONCEPTUALLY_SIMILAR',
-            'similar_procedural': 'PROCEDURALLY_SIMILAR',
-            'domain_bridge': 'BRIDGES_DOMAIN',
-            'grade_progression': 'PROGRESSES_TO',
-            'corequisite': 'COREQUISITE',
-            'extends': 'EXTENDS',
-            'applies_to': 'APPLIES_TO'
-        }
-        return mapping.get(relation_type, 'RELATED_TO')
+        return RELATION_TYPE_MAP.get(relation_type, DEFAULT_RELATION_TYPE)
     
-    def _create_indexes(self, session):
-        """Create indexes for performance"""
-        indexes = [
-            "CREATE INDEX standard_code_idx IF NOT EXISTS FOR (s:AchievementStandard) ON (s.code)",
-            "CREATE INDEX level_id_idx IF NOT EXISTS FOR (l:AchievementLevel) ON (l.id)",
-            "CREATE INDEX grade_code_idx IF NOT EXISTS FOR (g:GradeLevel) ON (g.code)",
-            "CREATE INDEX domain_code_idx IF NOT EXISTS FOR (d:Domain) ON (d.code)"
-        ]
+    def export_import_csv(self, all_results: Dict[str, Any], directory) -> Dict[str, List[str]]:
+        """Write the graph as neo4j-admin import CSVs; returns the node and relationship file paths"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        curriculum_data = self._load_curriculum_data(all_results) or {}
+        standards = self._standard_rows(curriculum_data) if 'achievement_standards' in curriculum_data else []
+        levels = self._level_rows(curriculum_data) if 'achievement_levels' in curriculum_data else []
+        standard_codes = {row['code'] for row in standards}
+        
+        files = {'nodes': [], 'relationships': []}
         
-        for index in indexes:
-            session.run(index)
+        def write(kind: str, name: str, header: List[str], rows):
+            path = directory / f"{name}.csv"
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows([self._csv_value(v) for v in row] for row in rows)
+            files[kind].append(str(path))
         
-        logger.info("Indexes created")
+        write('nodes', 'grade_levels', ['code:ID(GradeLevel)', 'name', 'grade_start:int', 'grade_end:int', ':LABEL'],
+              ([g['code'], g['name'], g['grade_start'], g['grade_end'], 'GradeLevel'] for g in GRADE_LEVELS))
+        write('nodes', 'domains', ['code:ID(Domain)', 'name', ':LABEL'],
+              ([d['code'], d['name'], 'Domain'] for d in DOMAINS))
+        write('nodes', 'achievement_standards',
+              ['code:ID(AchievementStandard)', 'title', 'content', 'grade_range', 'domain_name', 'difficulty:int',
+               'standard_order:int', 'level_id:int', 'domain_id:int', ':LABEL'],
+              ([r['code'], r['title'], r['content'], r['grade_range'], r['domain_name'], r['difficulty'],
+                r['standard_order'], r['level_id'], r['domain_id'], 'AchievementStandard'] for r in standards))
+        write('nodes', 'achievement_levels',
+              ['id:ID(AchievementLevel)', 'achievement_level_id:int', 'standard_code', 'level_code', 'level_name',
+               'description', ':LABEL'],
+              ([r['id'], r['achievement_level_id'], r['standard_code'], r['level_code'], r['level_name'],
+                r['description'], 'AchievementLevel'] for r in levels))
+        
+        # Hierarchical relationships, matching _create_hierarchical_relationships
+        write('relationships', 'has_domain', [':START_ID(GradeLevel)', ':END_ID(Domain)', ':TYPE'],
+              ([g['code'], d['code'], 'HAS_DOMAIN'] for g in GRADE_LEVELS for d in DOMAINS))
+        write('relationships', 'domain_contains_standard', [':START_ID(Domain)', ':END_ID(AchievementStandard)', ':TYPE'],
+              ([r['domain_code'], r['code'], 'CONTAINS_STANDARD'] for r in standards
+               if r['domain_code'] in DOMAIN_CODES.values()))
+        write('relationships', 'grade_contains_standard',
+              [':START_ID(GradeLevel)', ':END_ID(AchievementStandard)', ':TYPE'],
+              ([r['grade_code'], r['code'], 'CONTAINS_STANDARD'] for r in standards
+               if r['grade_code'] in GRADE_CODES.values()))
+        write('relationships', 'has_level', [':START_ID(AchievementStandard)', ':END_ID(AchievementLevel)', ':TYPE'],
+              ([r['standard_code'], r['id'], 'HAS_LEVEL'] for r in levels if r['standard_code'] in standard_codes))
+        
+        # Educational relationships; the type is a column, so all of them share one file
+        write('relationships', 'educational',
+              [':START_ID(AchievementStandard)', ':END_ID(AchievementStandard)', ':TYPE', 'weight:float',
+               'reasoning', 'relation_type'],
+              ([r['source_code'], r['target_code'], neo4j_relation, r['weight'], r['reasoning'], r['relation_type']]
+               for neo4j_relation, rows in self._educational_rows(all_results).items() for r in rows
+               if r['source_code'] in standard_codes and r['target_code'] in standard_codes))
+        
+        logger.info(f"Wrote import CSVs for {len(standards)} standards and {len(levels)} levels to {directory}")
+        return files
+    
+    @staticmethod
+    def _csv_value(value):
+        """Empty string for missing values, which neo4j-admin treats as an absent property"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return ''
+        return value
+    
+    def bulk_import(self, all_results: Dict[str, Any], directory, database: Optional[str] = None,
+                    neo4j_admin: str = "neo4j-admin"):
+        """Build the whole graph offline with neo4j-admin import; the target database must be stopped"""
+        database = database or config.database.neo4j_database
+        files = self.export_import_csv(all_results, directory)
+        
+        command = [neo4j_admin, 'database', 'import', 'full', '--overwrite-destination', '--multiline-fields=true']
+        command += [f"--nodes={path}" for path in files['nodes']]
+        command += [f"--relationships={path}" for path in files['relationships']]
+        command.append(database)
+        
+        logger.info(f"Running {' '.join(command)}")
+        subprocess.run(command, check=True)
+        self._invalidate_reads()
+        logger.info(f"Bulk import into {database} completed")
     
     def _create_constraints(self, session):
-        """Create constraints"""
-        constraints = [
-            "CREATE CONSTRAINT standard_code_unique IF NOT EXISTS FOR (s:AchievementStandard) REQUIRE s.code IS UNIQUE",
-            "CREATE CONSTRAINT level_id_unique IF NOT EXISTS FOR (l:AchievementLevel) REQUIRE l.id IS UNIQUE",
-            "CREATE CONSTRAINT grade_code_unique IF NOT EXISTS FOR (g:GradeLevel) REQUIRE g.code IS UNIQUE",
-            "CREATE CONSTRAINT domain_code_unique IF NOT EXISTS FOR (d:Domain) REQUIRE d.code IS UNIQUE"
-        ]
-        
-        for constraint in constraints:
-            try:
-                session.run(constraint)
-            except Exception as e:
-                logger.warning(f"Constraint creation failed (may already exist): {e}")
+        """Create uniqueness constraints, which also provide the lookup indexes"""
+        # Plain indexes from earlier runs on the same properties would block the constraints,
+        # so they are dropped in a transaction that commits before the constraints are created
+        session.execute_write(self._run_statements, LEGACY_INDEX_DROPS)
+        
+        # IF NOT EXISTS makes reruns no-ops, so any failure here is a real error
+        session.execute_write(self._run_statements, CONSTRAINT_QUERIES)
         
         logger.info("Constraints created")
     
-    def query_similar_standards(self, standard_code: str, limit: int = 5) -> List[Dict]:
+    @staticmethod
+    def _run_statements(tx, statements):
+        """Run parameterless statements in one managed transaction"""
+        for statement in statements:
+            tx.run(statement).consume()
+    
+    def _read(self, query: str, **params) -> Iterator[Dict]:
+        """Stream records for a read query, or replay them inside a cached_reads() block"""
+        cache = self._read_cache
+        key = _ReadCache.key(query, params)
+        if cache is not None:
+            rows = cache.get(key)
+            if rows is not None:
+                yield from rows
+                return
+        
+        rows = []
+        with self.get_driver().session(database=config.database.neo4j_database,
+                                       default_access_mode=READ_ACCESS) as session:
+            for record in session.run(query, params):
+                row = record.data()
+                if cache is not None:
+                    rows.append(dict(row))
+                yield row
+        
+        # Only a fully consumed result is complete enough to replay
+        if cache is not None:
+            cache.put(key, rows)
+    
+    def query_similar_standards(self, standard_code: str, limit: int = 5) -> Iterator[Dict]:
         """Query similar standards"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s1:AchievementStandard {code: $code})-[r:SIMILAR_TO|CONCEPTUALLY_SIMILAR|PROCEDURALLY_SIMILAR]-(s2:AchievementStandard)
-                RETURN s2.code as code, s2.content as content, r.weight as similarity, type(r) as relation_type
-                ORDER BY r.weight DESC
-                LIMIT $limit
-            """, code=standard_code, limit=limit)
-            
-            return [dict(record) for record in result]
-    
-    def query_prerequisite_chain(self, standard_code: str) -> List[Dict]:
-        """Query prerequisite chain"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH path = (start:AchievementStandard)-[:PREREQUISITE*1..5]->(end:AchievementStandard {code: $code})
-                RETURN [node in nodes(path) | {code: node.code, content: node.content}] as chain,
-                       length(path) as chain_length
-                ORDER BY chain_length
-            """, code=standard_code)
-            
-            return [dict(record) for record in result]
+        return self._read(SIMILAR_STANDARDS_QUERY, code=standard_code, limit=limit)
+    
+    def query_prerequisite_chain(self, standard_code: str, limit: int = 100) -> Iterator[Dict]:
+        """Query prerequisite chain, the shortest chain from each prerequisite up to five hops away"""
+        return self._read(PREREQUISITE_CHAIN_QUERY, code=standard_code, limit=limit)
     
-    def query_learning_pathway(self, domain_code: str, grade_code: str) -> List[Dict]:
+    def query_learning_pathway(self, domain_code: str, grade_code: str) -> Iterator[Dict]:
         """Query learning pathway for domain and grade"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (g:GradeLevel {code: $grade_code})-[:CONTAINS_STANDARD]->(s:AchievementStandard)
-                WHERE s.domain_code = $domain_code
-                OPTIONAL MATCH (s)-[r:PREREQUISITE]->(next:AchievementStandard)
-                RETURN s.code as code, s.content as content, s.difficulty as difficulty,
-                       collect({next_code: next.code, weight: r.weight}) as next_steps
-                ORDER BY s.difficulty
-            """, domain_code=domain_code, grade_code=grade_code)
-            
-            return [dict(record) for record in result]
+        return self._read(LEARNING_PATHWAY_QUERY, domain_code=domain_code, grade_code=grade_code)
     
     def get_graph_statistics(self) -> Dict[str, Any]:
         """Get graph statistics"""
-        with self.driver.session() as session:
-            # Node counts
-            node_stats = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] as label, count(n) as count
-            """)
-            
-            # Relationship counts
-            rel_stats = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) as relationship, count(r) as count
-            """)
-            
-            # Graph metrics
-            metrics = session.run("""
-                MATCH (n)
-                WITH count(n) as node_count
-                MATCH ()-[r]->()
-                WITH node_count, count(r) as edge_count
-                RETURN node_count, edge_count, 
-                       round(edge_count * 2.0 / node_count / (node_count - 1), 4) as density
-            """).single()
-            
-            return {
-                'nodes': {record['label']: record['count'] for record in node_stats},
-                'relationships': {record['relationship']: record['count'] for record in rel_stats},
-                'metrics': dict(metrics) if metrics else {}
-            }
+        if Neo4jManager._apoc_available:
+            try:
+                return self._statistics(META_STATS_QUERY, _summarize_meta_stats)
+            except ClientError as e:
+                if e.code != PROCEDURE_NOT_FOUND:
+                    raise
+                Neo4jManager._apoc_available = False
+                logger.info("APOC is not installed; counting nodes and relationships by scan")
+        
+        return self._statistics(GRAPH_STATISTICS_QUERY, _summarize_graph_statistics)
+    
+    def _statistics(self, query: str, summarize) -> Dict[str, Any]:
+        """Run a statistics query and summarize its single record"""
+        return self.get_driver().execute_query(
+            query,
+            database_=config.database.neo4j_database,
+            routing_=RoutingControl.READ,
+            result_transformer_=lambda result: summarize(result.single())
+        )
+
+
+class AsyncNeo4jManager:
+    """Read-only graph queries on the async driver, so concurrent requests overlap Bolt latency"""
+    
+    def __init__(self):
+        # Async drivers belong to the event loop that created them, so this one is per instance
+        self.driver = AsyncGraphDatabase.driver(
+            config.database.neo4j_uri,
+            auth=(config.database.neo4j_user, config.database.neo4j_password),
+            max_connection_pool_size=config.database.neo4j_max_pool_size,
+            connection_acquisition_timeout=config.database.neo4j_acquisition_timeout,
+            connection_timeout=config.database.neo4j_connection_timeout,
+            max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+            keep_alive=True
+        )
+        self._apoc_available = True
+        # Set only inside cached_reads()
+        self._read_cache = None
+    
+    async def aclose(self):
+        """Close the driver and its pooled connections"""
+        await self.driver.close()
+    
+    @contextmanager
+    def cached_reads(self, ttl: float = READ_CACHE_TTL):
+        """Serve repeated query_* calls from memory within this block, each result for at most ttl seconds"""
+        previous, self._read_cache = self._read_cache, _ReadCache(ttl)
+        try:
+            yield self
+        finally:
+            self._read_cache = previous
+    
+    async def _read(self, query: str, **params) -> List[Dict]:
+        """Run a read query with read routing and return its records, or replay them inside cached_reads()"""
+        cache = self._read_cache
+        key = _ReadCache.key(query, params)
+        if cache is not None:
+            rows = cache.get(key)
+            if rows is not None:
+                return rows
+        
+        rows = await self.driver.execute_query(
+            query, params,
+            database_=config.database.neo4j_database,
+            routing_=RoutingControl.READ,
+            result_transformer_=AsyncResult.data
+        )
+        if cache is not None:
+            cache.put(key, [dict(row) for row in rows])
+        return rows
+    
+    async def query_similar_standards(self, standard_code: str, limit: int = 5) -> List[Dict]:
+        """Query similar standards"""
+        return await self._read(SIMILAR_STANDARDS_QUERY, code=standard_code, limit=limit)
+    
+    async def query_prerequisite_chain(self, standard_code: str, limit: int = 100) -> List[Dict]:
+        """Query prerequisite chain, the shortest chain from each prerequisite up to five hops away"""
+        return await self._read(PREREQUISITE_CHAIN_QUERY, code=standard_code, limit=limit)
+    
+    async def query_learning_pathway(self, domain_code: str, grade_code: str) -> List[Dict]:
+        """Query learning pathway for domain and grade"""
+        return await self._read(LEARNING_PATHWAY_QUERY, domain_code=domain_code, grade_code=grade_code)
+    
+    async def get_graph_statistics(self) -> Dict[str, Any]:
+        """Get graph statistics"""
+        if self._apoc_available:
+            try:
+                return await self._statistics(META_STATS_QUERY, _summarize_meta_stats)
+            except ClientError as e:
+                if e.code != PROCEDURE_NOT_FOUND:
+                    raise
+                self._apoc_available = False
+                logger.info("APOC is not installed; counting nodes and relationships by scan")
+        
+        return await self._statistics(GRAPH_STATISTICS_QUERY, _summarize_graph_statistics)
+    
+    async def _statistics(self, query: str, summarize) -> Dict[str, Any]:
+        """Run a statistics query and summarize its single record"""
+        async def transform(result: AsyncResult) -> Dict[str, Any]:
+            return summarize(await result.single())
+        
+        return await self.driver.execute_query(
+            query,
+            database_=config.database.neo4j_database,
+            routing_=RoutingControl.READ,
+            result_transformer_=transform
+        )
+
+
+def _summarize_meta_stats(record) -> Dict[str, Any]:
+    """Per-label and per-type counts from META_STATS_QUERY, plus totals and density"""
+    # apoc.meta.stats also lists labels and types that currently have no members
+    nodes = {label: count for label, count in record['labels'].items() if count} if record else {}
+    relationships = {rel: count for rel, count in record['relTypesCount'].items() if count} if record else {}
+    return _graph_statistics(nodes, relationships)
+
+
+def _summarize_graph_statistics(record) -> Dict[str, Any]:
+    """Per-label and per-type counts from GRAPH_STATISTICS_QUERY, plus totals and density"""
+    nodes = {row['label']: row['count'] for row in record['node_stats']} if record else {}
+    relationships = {row['relationship']: row['count'] for row in record['rel_stats']} if record else {}
+    return _graph_statistics(nodes, relationships)
+
+
+def _graph_statistics(nodes: Dict[str, int], relationships: Dict[str, int]) -> Dict[str, Any]:
+    """Statistics payload with totals and density derived from the per-label and per-type counts"""
+    # Graph metrics
+    node_count = sum(nodes.values())
+    edge_count = sum(relationships.values())
+    metrics = {
+        'node_count': node_count,
+        'edge_count': edge_count,
+        'density': round(edge_count * 2.0 / (node_count * (node_count - 1)), 4) if node_count > 1 else 0.0
+    }
+    
+    return {
+        'nodes': nodes,
+        'relationships': relationships,
+        'metrics': metrics
+    }
@@ -2,12 +2,53 @@
 Phase 1: Foundation Structure Design using Gemini 2.5 Pro
 """
 import asyncio
-import json
+import copy
+import os
 from typing import Dict, List, Any
 from loguru import logger
 import pandas as pd
+from config.settings import config
 from src.ai_models import AIModelManager
+from src.artifacts import dumps_json, save_artifact
 from src.data_manager import CurriculumDataProcessor
+from src.json_utils import extract_json
+
+# Designs used when a response cannot be parsed; _ai_json hands out deep copies, so a
+# caller editing its result never changes the fallback seen by later calls
+FALLBACK_NODE_STRUCTURE = {
+    "node_types": {
+        "achievement_standard": {
+            "properties": ["code", "content", "difficulty", "cognitive_level"],
+            "estimated_count": 181
+        },
+        "achievement_level": {
+            "properties": ["level", "description", "complexity"],
+            "estimated_count": 843
+        }
+    }
+}
+FALLBACK_RELATIONSHIP_CATEGORIES = {
+    "relationship_types": {
+        "prerequisite": {"weight_range": [0.8, 1.0], "directed": True},
+        "similar_to": {"weight_range": [0.5, 0.9], "directed": False}
+    }
+}
+FALLBACK_COMMUNITY_CLUSTERS = {
+    "levels": {
+        "level_0": {"cluster_count": 10, "resolution": 0.1},
+        "level_1": {"cluster_count": 25, "resolution": 0.5},
+        "level_2": {"cluster_count": 50, "resolution": 1.0}
+    }
+}
+FALLBACK_HIERARCHICAL_STRUCTURE = {
+    "levels": {
+        "curriculum": {"count": 1},
+        "grade_groups": {"count": 4},
+        "domains": {"count": 4},
+        "standards": {"count": 181},
+        "levels": {"count": 843}
+    }
+}
 
 class FoundationDesigner:
     """Designs the foundational structure of the knowledge graph"""
@@ -16,25 +57,25 @@ class FoundationDesigner:
         self.ai_manager = ai_manager
         self.model_name = 'gemini_pro'  # Using Gemini 2.5 Pro for 1M token context
         self.hierarchical_summary = {}  # Store hierarchical structure for metadata calculation
+        # Caps the gathered design calls in flight, so they stay under the provider's rate limit
+        self._semaphore = asyncio.Semaphore(config.processing.max_concurrent)
+        if config.processing.debug_dump:
+            os.makedirs('debug', exist_ok=True)
     
     async def design_complete_structure(self, curriculum_data: Dict[str, Any]) -> Dict[str, Any]:
         """Design complete knowledge graph structure"""
         logger.info("Starting foundation structure design with Gemini 2.5 Pro")
         
-        # Create comprehensive context
+        # Create comprehensive context; it is sent as the shared cacheable prefix of every design prompt
         context = CurriculumDataProcessor.create_context_for_ai(curriculum_data)
         
-        # Design node structure
-        node_structure = await self._design_node_structure(context, curriculum_data)
-        
-        # Design relationship categories
-        relationship_categories = await self._design_relationship_categories(context)
-        
-        # Design community clusters
-        community_clusters = await self._design_community_clusters(context)
-        
-        # Design hierarchical structure
-        hierarchical_structure = await self._design_hierarchical_structure(context)
+        # The four design prompts are independent, so they run concurrently
+        node_structure, relationship_categories, community_clusters, hierarchical_structure = await asyncio.gather(
+            self._design_node_structure(context, curriculum_data),
+            self._design_relationship_categories(context),
+            self._design_community_clusters(context),
+            self._design_hierarchical_structure(context)
+        )
         
         # Store hierarchical structure for metadata calculation
         self.hierarchical_summary = hierarchical_structure
@@ -57,7 +98,7 @@ class FoundationDesigner:
     async def _design_node_structure(self, context: str, curriculum_data: Dict) -> Dict[str, Any]:
         """Design node types and their attributes"""
         
-        # Include sample data for better analysis
+        # Include sample data for better analysis; compact JSON keeps the prompt's token count down
         sample_standards = curriculum_data['achievement_standards'].head(10).to_dict('records')
         sample_levels = curriculum_data['achievement_levels'].head(10).to_dict('records')
         
@@ -66,13 +107,11 @@ class FoundationDesigner:
         representation_types = curriculum_data.get('representation_types', pd.DataFrame())
         
         prompt = f"""
-{context}
-
 샘플 성취기준 데이터:
-{json.dumps(sample_standards, ensure_ascii=False, indent=2)}
+{dumps_json(sample_standards).decode()}
 
 샘플 성취수준 데이터:
-{json.dumps(sample_levels, ensure_ascii=False, indent=2)}
+{dumps_json(sample_levels).decode()}
 
 역량 (5개): {competencies['comp_name'].tolist() if not competencies.empty else []}
 표상 타입 (9개): {representation_types['type_name'].tolist() if not representation_types.empty else []}
@@ -89,50 +128,12 @@ class FoundationDesigner:
 순수 JSON만 출력하세요. 설명이나 마크다운 없이 JSON 객체만 반환하세요.
 """
         
-        response = await self.ai_manager.get_completion(self.model_name, prompt)
-        
-        # Dump response for debugging
-        import os
-        os.makedirs('debug', exist_ok=True)
-        with open('debug/node_structure_response.txt', 'w', encoding='utf-8') as f:
-            f.write(response['content'])
-        logger.info("Response dumped to debug/node_structure_response.txt")
-        
-        try:
-            # Extract JSON from response
-            content = response['content']
-            
-            # Try to find JSON in code block first
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Find JSON block directly
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                json_str = content[start_idx:end_idx]
-            
-            # Clean up common issues
-            json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-            json_str = re.sub(r',\s*}', '}', json_str)  # Remove trailing commas
-            json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas in arrays
-            
-            node_structure = json.loads(json_str)
-            logger.info("Node structure designed successfully")
-            return node_structure
-            
-        except Exception as e:
-            logger.error(f"Failed to parse node structure: {e}")
-            # Return fallback structure
-            return self._get_fallback_node_structure()
+        return await self._ai_json('node_structure', prompt, context, FALLBACK_NODE_STRUCTURE)
     
     async def _design_relationship_categories(self, context: str) -> Dict[str, Any]:
         """Design relationship categories and types"""
         
         prompt = f"""
-{context}
-
 한국 수학 교육과정의 특성을 고려하여 지식 그래프의 관계(엣지) 체계를 설계하세요.
 
 설계 기준:
@@ -161,46 +162,12 @@ class FoundationDesigner:
 출력 형식: 순수 JSON만 출력하세요. 설명 없이 JSON 객체만 반환하세요.
 """
         
-        response = await self.ai_manager.get_completion(self.model_name, prompt)
-        
-        # Dump response for debugging
-        with open('debug/relationship_categories_response.txt', 'w', encoding='utf-8') as f:
-            f.write(response['content'])
-        logger.info("Response dumped to debug/relationship_categories_response.txt")
-        
-        try:
-            content = response['content']
-            
-            # Try to find JSON in code block first
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Find JSON block directly
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                json_str = content[start_idx:end_idx]
-            
-            # Clean up common issues
-            json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
-            relationship_categories = json.loads(json_str)
-            logger.info("Relationship categories designed successfully")
-            return relationship_categories
-            
-        except Exception as e:
-            logger.error(f"Failed to parse relationship categories: {e}")
-            return self._get_fallback_relationship_categories()
+        return await self._ai_json('relationship_categories', prompt, context, FALLBACK_RELATIONSHIP_CATEGORIES)
     
     async def _design_community_clusters(self, context: str) -> Dict[str, Any]:
         """Design community cluster definitions"""
         
         prompt = f"""
-{context}
-
 지식 그래프의 커뮤니티 클러스터 체계를 3단계 계층으로 설계하세요.
 
 Level 0 (대분류): Resolution 0.1, 8-12개 클러스터
@@ -221,46 +188,12 @@ Level 2 (소분류): Resolution 1.0, 40-60개 클러스터
 출력 형식: 순수 JSON만 출력하세요. 설명 없이 JSON 객체만 반환하세요.
 """
         
-        response = await self.ai_manager.get_completion(self.model_name, prompt)
-        
-        # Dump response for debugging
-        with open('debug/community_clusters_response.txt', 'w', encoding='utf-8') as f:
-            f.write(response['content'])
-        logger.info("Response dumped to debug/community_clusters_response.txt")
-        
-        try:
-            content = response['content']
-            
-            # Try to find JSON in code block first
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Find JSON block directly
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                json_str = content[start_idx:end_idx]
-            
-            # Clean up common issues
-            json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
-            community_clusters = json.loads(json_str)
-            logger.info("Community clusters designed successfully")
-            return community_clusters
-            
-        except Exception as e:
-            logger.error(f"Failed to parse community clusters: {e}")
-            return self._get_fallback_community_clusters()
+        return await self._ai_json('community_clusters', prompt, context, FALLBACK_COMMUNITY_CLUSTERS)
     
     async def _design_hierarchical_structure(self, context: str) -> Dict[str, Any]:
         """Design overall hierarchical structure"""
         
         prompt = f"""
-{context}
-
 전체 지식 그래프의 계층적 구조를 설계하세요.
 
 계층 구조:
@@ -281,39 +214,34 @@ Level 2 (소분류): Resolution 1.0, 40-60개 클러스터
 출력 형식: 순수 JSON만 출력하세요. 설명 없이 JSON 객체만 반환하세요.
 """
         
-        response = await self.ai_manager.get_completion(self.model_name, prompt)
-        
-        # Dump response for debugging
-        with open('debug/hierarchical_structure_response.txt', 'w', encoding='utf-8') as f:
-            f.write(response['content'])
-        logger.info("Response dumped to debug/hierarchical_structure_response.txt")
+        return await self._ai_json('hierarchical_structure', prompt, context, FALLBACK_HIERARCHICAL_STRUCTURE)
+    
+    async def _ai_json(self, name: str, prompt: str, context: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a JSON-mode design prompt and parse it, or return the fallback design if parsing fails"""
+        async with self._semaphore:
+            response = await self.ai_manager.get_completion(self.model_name, prompt, cached_prefix=context,
+                                                            response_mime_type="application/json")
+        label = name.replace('_', ' ')
         
         try:
-            content = response['content']
+            # Dump response for debugging, off the event loop so the other design calls keep running
+            if config.processing.debug_dump:
+                await asyncio.to_thread(self._dump_response, name, response['content'])
             
-            # Try to find JSON in code block first
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Find JSON block directly
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                json_str = content[start_idx:end_idx]
-            
-            # Clean up common issues
-            json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
-            hierarchical_structure = json.loads(json_str)
-            logger.info("Hierarchical structure designed successfully")
-            return hierarchical_structure
+            design = extract_json(response['content'])
+            logger.info(f"{label.capitalize()} designed successfully")
+            return design
             
         except Exception as e:
-            logger.error(f"Failed to parse hierarchical structure: {e}")
-            return self._get_fallback_hierarchical_structure()
+            logger.error(f"Failed to parse {label}: {e}")
+            return copy.deepcopy(fallback)
+    
+    @staticmethod
+    def _dump_response(name: str, content: str):
+        """Write a raw design response to debug/"""
+        with open(f'debug/{name}_response.txt', 'w', encoding='utf-8') as f:
+            f.write(content)
+        logger.info(f"Response dumped to debug/{name}_response.txt")
     
     def _count_planned_nodes(self, node_structure: Dict) -> int:
         """Count total planned nodes from hierarchical structure summary"""
@@ -359,52 +287,6 @@ Level 2 (소분류): Resolution 1.0, 40-60개 클러스터
         except Exception as e:
             logger.warning(f"Failed to estimate relationships: {e}")
             return 3000  # Default estimate
-    
-    def _get_fallback_node_structure(self) -> Dict[str, Any]:
-        """Fallback node structure"""
-        return {
-            "node_types": {
-                "achievement_standard": {
-                    "properties": ["code", "content", "difficulty", "cognitive_level"],
-                    "estimated_count": 181
-                },
-                "achievement_level": {
-                    "properties": ["level", "description", "complexity"],
-                    "estimated_count": 843
-                }
-            }
-        }
-    
-    def _get_fallback_relationship_categories(self) -> Dict[str, Any]:
-        """Fallback relationship categories"""
-        return {
-            "relationship_types": {
-                "prerequisite": {"weight_range": [0.8, 1.0], "directed": True},
-                "similar_to": {"weight_range": [0.5, 0.9], "directed": False}
-            }
-        }
-    
-    def _get_fallback_community_clusters(self) -> Dict[str, Any]:
-        """Fallback community clusters"""
-        return {
-            "levels": {
-                "level_0": {"cluster_count": 10, "resolution": 0.1},
-                "level_1": {"cluster_count": 25, "resolution": 0.5},
-                "level_2": {"cluster_count": 50, "resolution": 1.0}
-            }
-        }
-    
-    def _get_fallback_hierarchical_structure(self) -> Dict[str, Any]:
-        """Fallback hierarchical structure"""
-        return {
-            "levels": {
-                "curriculum": {"count": 1},
-                "grade_groups": {"count": 4},
-                "domains": {"count": 4},
-                "standards": {"count": 181},
-                "levels": {"count": 843}
-            }
-        }
 
 # Main execution function for Phase 1
 async def run_phase1(curriculum_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -419,8 +301,7 @@ async def run_phase1(curriculum_data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Save results
         output_path = "output/phase1_foundation_design.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(foundation_design, f, ensure_ascii=False, indent=2)
+        save_artifact(foundation_design, output_path)
         
         logger.info(f"Phase 1 completed. Results saved to {output_path}")
         
@@ -439,8 +320,8 @@ if __name__ == "__main__":
     from src.data_manager import DatabaseManager
     
     async def test_phase1():
-        db_manager = DatabaseManager()
-        curriculum_data = db_manager.extract_all_curriculum_data()
+        with DatabaseManager() as db_manager:
+            curriculum_data = db_manager.extract_all_curriculum_data()
         result = await run_phase1(curriculum_data)
         print("Phase 1 test completed")
     
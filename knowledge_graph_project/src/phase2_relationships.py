@@ -3,13 +3,14 @@ Phase 2: Relationship Extraction using GPT-5 with batch processing
 Stabilized version using database views for suggestions
 """
 import asyncio
-import json
 import itertools
 from typing import Dict, List, Any, Tuple
 from loguru import logger
 import pandas as pd
 from src.ai_models import AIModelManager
+from src.artifacts import save_artifact
 from src.data_manager import CurriculumDataProcessor
+from src.json_utils import extract_json
 
 class RelationshipExtractor:
     """Extracts relationships between curriculum elements using GPT-4o"""
@@ -212,11 +213,7 @@ B: [{std_b.standard_code}] {std_b.standard_content[:100]}...
         try:
             response = await self.ai_manager.get_completion(self.model_name, prompt, max_tokens=1000)
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            batch_results = json.loads(json_str)
+            batch_results = extract_json(content)
             
             relations = []
             for idx, (std_a, std_b) in enumerate(standard_pairs):
@@ -295,11 +292,7 @@ B: [{std_b.standard_code}] {std_b.standard_content[:100]}...
         try:
             response = await self.ai_manager.get_completion(self.model_name, prompt, max_tokens=800)
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             relations = []
             
             for relation in result.get('bridge_relations', []):
@@ -377,11 +370,7 @@ B: [{std_b.standard_code}] {std_b.standard_content[:100]}...
         try:
             response = await self.ai_manager.get_completion(self.model_name, prompt, max_tokens=600)
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             relations = []
             
             for relation in result.get('progression_relations', []):
@@ -468,11 +457,7 @@ B: [{std_b.standard_code}] {std_b.standard_content[:100]}...
         try:
             response = await self.ai_manager.get_completion(self.model_name, prompt, max_tokens=600)
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             relations = []
             
             for rel in result.get('cluster_relations', []):
@@ -601,8 +586,7 @@ async def run_phase2(curriculum_data: Dict[str, Any], foundation_design: Dict[st
         
         # Save results
         output_path = "output/phase2_relationship_extraction.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(relationship_extraction, f, ensure_ascii=False, indent=2)
+        save_artifact(relationship_extraction, output_path)
         
         logger.info(f"Phase 2 completed. Results saved to {output_path}")
         
@@ -622,8 +606,8 @@ if __name__ == "__main__":
         from src.data_manager import DatabaseManager
         from src.phase1_foundation import run_phase1
         
-        db_manager = DatabaseManager()
-        curriculum_data = db_manager.extract_all_curriculum_data()
+        with DatabaseManager() as db_manager:
+            curriculum_data = db_manager.extract_all_curriculum_data()
         foundation_design = await run_phase1(curriculum_data)
         result = await run_phase2(curriculum_data, foundation_design)
         print("Phase 2 test completed")
@@ -3,9 +3,15 @@ Phase 3: Advanced Refinement using Claude Sonnet 4
 """
 import asyncio
 import json
+import re
 from typing import Dict, List, Any, Tuple
 from loguru import logger
 from src.ai_models import AIModelManager
+from src.artifacts import load_artifact, save_artifact
+from src.json_utils import extract_json
+
+# Leading grade digits of a standard code (e.g., '2수01-01' -> 2)
+GRADE_PREFIX_RE = re.compile(r'^(\d+)')
 
 class RelationshipRefiner:
     """Refines and enhances relationships using Claude Sonnet 4"""
@@ -93,17 +99,28 @@ class RelationshipRefiner:
         refined_relations = []
         batch_size = 30
         
-        for i in range(0, len(relations), batch_size):
-            batch = relations[i:i+batch_size]
-            refined_batch = await self._process_type_refinement_batch(batch)
-            refined_relations.extend(refined_batch)
+        batches = [relations[i:i+batch_size] for i in range(0, len(relations), batch_size)]
+        
+        prompts = [self._build_type_refinement_prompt(batch) for batch in batches]
+        responses = await self.ai_manager.get_completions_bulk(
+            self.model_name,
+            prompts,
+            thinking_budget=3000  # Extended thinking for nuanced analysis
+        )
+        
+        for batch_num, (batch, response) in enumerate(zip(batches, responses), 1):
+            if isinstance(response, Exception):
+                logger.error(f"Type refinement failed for batch {batch_num}/{len(batches)}: {response}")
+                refined_relations.extend(batch)
+                continue
             
-            logger.info(f"Refined types for batch {i//batch_size + 1}/{(len(relations)-1)//batch_size + 1}")
+            refined_relations.extend(self._merge_type_refinements(batch, response))
+            logger.info(f"Refined types for batch {batch_num}/{len(batches)}")
         
         return refined_relations
     
-    async def _process_type_refinement_batch(self, relations: List[Dict]) -> List[Dict]:
-        """Process a batch of relations for type refinement"""
+    def _build_type_refinement_prompt(self, relations: List[Dict]) -> str:
+        """Build the type refinement prompt for a batch of relations"""
         
         relations_text = json.dumps(relations, ensure_ascii=False, indent=2)
         
@@ -150,20 +167,13 @@ class RelationshipRefiner:
   ]
 }}
 """
-        
-        response = await self.ai_manager.get_completion(
-            self.model_name, 
-            prompt,
-            thinking_budget=3000  # Extended thinking for nuanced analysis
-        )
-        
+        return prompt
+    
+    def _merge_type_refinements(self, relations: List[Dict], response: Dict[str, Any]) -> List[Dict]:
+        """Merge refined types from a model response into the batch"""
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             refined = result.get('refined_relations', [])
             
             # Merge with original data
@@ -246,11 +256,7 @@ class RelationshipRefiner:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             adjustments = result.get('weight_adjustments', [])
             
             # Apply adjustments
@@ -282,15 +288,23 @@ class RelationshipRefiner:
         enriched_relations = []
         batch_size = 20
         
-        for i in range(0, len(relations), batch_size):
-            batch = relations[i:i+batch_size]
-            enriched_batch = await self._enrich_batch_with_metadata(batch)
-            enriched_relations.extend(enriched_batch)
+        batches = [relations[i:i+batch_size] for i in range(0, len(relations), batch_size)]
+        
+        prompts = [self._build_metadata_prompt(batch) for batch in batches]
+        responses = await self.ai_manager.get_completions_bulk(self.model_name, prompts)
+        
+        for batch_num, (batch, response) in enumerate(zip(batches, responses), 1):
+            if isinstance(response, Exception):
+                logger.error(f"Metadata enrichment failed for batch {batch_num}/{len(batches)}: {response}")
+                enriched_relations.extend(batch)
+                continue
+            
+            enriched_relations.extend(self._merge_metadata(batch, response))
         
         return enriched_relations
     
-    async def _enrich_batch_with_metadata(self, relations: List[Dict]) -> List[Dict]:
-        """Enrich a batch of relations with educational metadata"""
+    def _build_metadata_prompt(self, relations: List[Dict]) -> str:
+        """Build the educational metadata prompt for a batch of relations"""
         
         prompt = f"""
 다음 수학 교육과정 관계들에 교육적 메타데이터를 추가하세요.
@@ -321,16 +335,13 @@ JSON 형식으로 응답하세요:
   ]
 }}
 """
-        
-        response = await self.ai_manager.get_completion(self.model_name, prompt)
-        
+        return prompt
+    
+    def _merge_metadata(self, relations: List[Dict], response: Dict[str, Any]) -> List[Dict]:
+        """Merge educational metadata from a model response into the batch"""
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             enrichments = result.get('enriched_relations', [])
             
             # Merge enrichments with original relations
@@ -404,11 +415,7 @@ JSON 형식으로 10-20개의 중요 누락 관계를 제안하세요:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            result = json.loads(json_str)
+            result = extract_json(content)
             missing = result.get('missing_relations', [])
             
             # Filter out already existing relations
@@ -467,9 +474,7 @@ JSON 형식으로 10-20개의 중요 누락 관계를 제안하세요:
     
     def _extract_grade_from_code(self, code: str) -> int:
         """Extract grade level from standard code"""
-        # Pattern: digit at start (e.g., '2수01-01' -> 2)
-        import re
-        match = re.match(r'^(\d+)', code)
+        match = GRADE_PREFIX_RE.match(code)
         if match:
             return int(match.group(1))
         return 0
@@ -534,8 +539,7 @@ async def run_phase3(relationship_data: Dict[str, Any], foundation_design: Dict[
         
         # Save results
         output_path = "output/phase3_refinement_results.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(refinement_results, f, ensure_ascii=False, indent=2)
+        save_artifact(refinement_results, output_path)
         
         logger.info(f"Phase 3 completed. Results saved to {output_path}")
         
@@ -555,11 +559,8 @@ if __name__ == "__main__":
     
     async def test_phase3():
         # Load test data
-        with open('output/phase2_relationship_extraction.json', 'r', encoding='utf-8') as f:
-            relationship_data = json.load(f)
-        
-        with open('output/phase1_foundation_design.json', 'r', encoding='utf-8') as f:
-            foundation_design = json.load(f)
+        relationship_data = load_artifact('output/phase2_relationship_extraction.json')
+        foundation_design = load_artifact('output/phase1_foundation_design.json')
         
         result = await run_phase3(relationship_data, foundation_design)
         print("Phase 3 test completed")
@@ -6,6 +6,15 @@ import json
 from typing import Dict, List, Any, Tuple, Optional
 from loguru import logger
 from src.ai_models import AIModelManager
+from src.json_utils import extract_json
+
+# Domain names by the two-digit domain code in a standard code
+DOMAIN_NAMES = {
+    '01': '수와 연산',
+    '02': '변화와 관계',
+    '03': '도형과 측정',
+    '04': '자료와 가능성'
+}
 
 class GraphValidator:
     """Validates and optimizes the complete knowledge graph using Claude Opus 4.1"""
@@ -155,11 +164,7 @@ class GraphValidator:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            validation_report = json.loads(json_str)
+            validation_report = extract_json(content)
             logger.info("Comprehensive validation completed")
             return validation_report
             
@@ -263,10 +268,7 @@ JSON 형식으로 응답하세요:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            return json.loads(json_str)
+            return extract_json(content)
         except:
             return {"message": "Cycles detected but analysis failed"}
     
@@ -353,10 +355,7 @@ JSON 형식으로 평가 결과를 제공하세요:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            return json.loads(json_str)
+            return extract_json(content)
         except:
             return {"coherence_score": 70, "message": "Analysis completed with warnings"}
     
@@ -400,21 +399,13 @@ JSON 형식으로 평가 결과를 제공하세요:
     
     def _analyze_domain_coverage(self, relations: List[Dict]) -> Dict[str, Any]:
         """Analyze coverage by domain"""
-        
-        domain_map = {
-            '01': '수와 연산',
-            '02': '변화와 관계',
-            '03': '도형과 측정',
-            '04': '자료와 가능성'
-        }
-        
-        domain_relations = {domain: 0 for domain in domain_map.values()}
+        domain_relations = {domain: 0 for domain in DOMAIN_NAMES.values()}
         
         for rel in relations:
             source = rel.get('source_code', '')
             if len(source) >= 4 and source[1:3] == '수':
                 domain_code = source[3:5]
-                domain_name = domain_map.get(domain_code, 'unknown')
+                domain_name = DOMAIN_NAMES.get(domain_code, 'unknown')
                 if domain_name in domain_relations:
                     domain_relations[domain_name] += 1
         
@@ -531,11 +522,7 @@ JSON 형식으로 응답하세요:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            recommendations = json.loads(json_str)
+            recommendations = extract_json(content)
             logger.info(f"Generated {len(recommendations.get('optimizations', []))} optimization recommendations")
             return recommendations
             
@@ -630,11 +617,7 @@ JSON 형식으로 응답하세요:
         
         try:
             content = response['content']
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            json_str = content[start_idx:end_idx]
-            
-            quality_assessment = json.loads(json_str)
+            quality_assessment = extract_json(content)
             logger.info("Overall quality assessment completed")
             return quality_assessment
             
@@ -0,0 +1,31 @@
+"""
+Process-level runtime setup shared by the phase runners
+"""
+import asyncio
+import os
+import sys
+
+from loguru import logger
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+
+def configure_logging() -> None:
+    """Replace loguru's default handler with a queued stderr sink"""
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=os.getenv("LOGURU_LEVEL", os.getenv("LOG_LEVEL", "INFO")),
+        enqueue=True,
+        backtrace=False,
+        diagnose=False
+    )
+
+
+def install_event_loop() -> None:
+    """Run asyncio on libuv via uvloop when it is installed"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
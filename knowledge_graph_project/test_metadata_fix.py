@@ -3,9 +3,7 @@
 Test script to verify metadata calculation fixes in phase1_foundation.py
 """
 import json
-import sys
 import os
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 from src.phase1_foundation import FoundationDesigner
 from src.ai_models import AIModelManager
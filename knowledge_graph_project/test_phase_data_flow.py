@@ -3,8 +3,6 @@
 Test script to verify data flow between phase1_foundation and phase2_relationships
 """
 import json
-import sys
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 def analyze_phase1_output():
     """Analyze Phase 1 output structure"""
@@ -4,7 +4,6 @@ Test script to verify data integration between Phase 1, 2, and 3
 """
 import json
 import sys
-sys.path.append('/Users/ldm/work/workspace/mathematics_curriculum_extraction/knowledge_graph_project')
 
 def test_data_flow_integration():
     """Test the integrated data flow between all phases"""
@@ -143,6 +143,28 @@ class TestOpenAIInterface:
         assert result['output_tokens'] == 50
         assert result['finish_reason'] == "stop"
     
+    def test_chat_params_gpt5(self, openai_interface):
+        """Test GPT-5 requests use max_completion_tokens and drop unsupported options"""
+        params = openai_interface._chat_params("Test prompt", temperature=0.3, verbosity="low", top_p=0.9)
+        
+        assert params['max_completion_tokens'] == 1000
+        assert 'max_tokens' not in params
+        assert 'temperature' not in params
+        assert 'verbosity' not in params
+        assert params['top_p'] == 0.9
+    
+    def test_chat_params_default_model(self, mock_config):
+        """Test other models keep temperature and max_tokens"""
+        mock_config.name = "gpt-4o"
+        with patch('src.ai_models.openai.AsyncOpenAI'):
+            interface = OpenAIInterface(mock_config)
+        
+        params = interface._chat_params("Test prompt", max_tokens=500, reasoning_effort="high")
+        
+        assert params['temperature'] == 0.7
+        assert params['max_tokens'] == 500
+        assert 'reasoning_effort' not in params
+    
     @pytest.mark.asyncio
     async def test_generate_completion_with_kwargs(self, openai_interface, mock_openai_client):
         """Test completion with additional parameters"""
@@ -170,16 +192,56 @@ class TestOpenAIInterface:
     
     @pytest.mark.asyncio
     async def test_generate_completion_error(self, openai_interface, mock_openai_client):
-        """Test error handling in completion generation"""
-        from tenacity import RetryError
-        
+        """Test non-transient errors are raised without retrying"""
         mock_openai_client.chat.completions.create = AsyncMock(
             side_effect=Exception("API Error")
         )
         
-        # The retry decorator will raise RetryError after failures
-        with pytest.raises(RetryError):
+        with pytest.raises(Exception, match="API Error"):
             await openai_interface.generate_completion("Test prompt")
+        mock_openai_client.chat.completions.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_generate_completion_retries_rate_limit(self, openai_interface, mock_openai_client):
+        """Test rate-limited calls are retried after the server's Retry-After hint"""
+        import httpx
+        import openai
+        
+        response = httpx.Response(429, headers={'retry-after': '0'},
+                                  request=httpx.Request('POST', 'https://api.openai.com/v1/chat/completions'))
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Recovered"
+        mock_response.choices[0].finish_reason = "stop"
+        mock_response.usage.prompt_tokens = 100
+        mock_response.usage.completion_tokens = 50
+        
+        mock_openai_client.chat.completions.create = AsyncMock(side_effect=[
+            openai.RateLimitError("Rate limited", response=response, body=None),
+            mock_response
+        ])
+        
+        result = await openai_interface.generate_completion("Test prompt")
+        
+        assert result['content'] == "Recovered"
+        assert mock_openai_client.chat.completions.create.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_generate_completion_retries_give_up(self, openai_interface, mock_openai_client):
+        """Test transient errors are re-raised once every attempt has failed"""
+        import openai
+        from src.ai_models import RETRY_MAX_ATTEMPTS
+        
+        mock_openai_client.chat.completions.create = AsyncMock(
+            side_effect=openai.APIConnectionError(request=Mock())
+        )
+        
+        with patch('src.ai_models.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            with pytest.raises(openai.APIConnectionError):
+                await openai_interface.generate_completion("Test prompt")
+        
+        assert mock_openai_client.chat.completions.create.call_count == RETRY_MAX_ATTEMPTS
+        assert mock_sleep.call_count == RETRY_MAX_ATTEMPTS - 1
     
     @pytest.mark.asyncio
     async def test_create_batch_job(self, openai_interface, mock_openai_client):
@@ -210,6 +272,76 @@ class TestOpenAIInterface:
         )
         
         assert batch_id == "batch-456"
+    
+    @pytest.mark.asyncio
+    async def test_generate_completion_stream(self, openai_interface, mock_openai_client):
+        """Test streamed chunks are yielded and usage is taken from the terminal chunk"""
+        def chunk(content=None, finish_reason=None, usage=None):
+            choices = [] if usage else [Mock(delta=Mock(content=content), finish_reason=finish_reason)]
+            return Mock(choices=choices, usage=usage)
+        
+        async def chunks():
+            yield chunk("Hello")
+            yield chunk(" world", finish_reason="stop")
+            yield chunk(usage=Mock(prompt_tokens=100, completion_tokens=50))
+        
+        mock_openai_client.chat.completions.create = AsyncMock(return_value=chunks())
+        
+        final = {}
+        texts = [text async for text in openai_interface.generate_completion_stream("Test prompt", final=final)]
+        
+        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
+        assert call_kwargs['stream'] is True
+        assert call_kwargs['stream_options'] == {"include_usage": True}
+        
+        assert texts == ["Hello", " world"]
+        assert final['content'] == "Hello world"
+        assert final['finish_reason'] == "stop"
+        assert final['cost'] == 0.002
+        assert openai_interface.total_cost == 0.002
+    
+    def test_clients_share_http_pool(self, mock_config):
+        """Test that OpenAI interfaces reuse one pooled HTTP client"""
+        with patch('src.ai_models.openai.AsyncOpenAI') as mock_cls:
+            OpenAIInterface(mock_config)
+            OpenAIInterface(mock_config)
+        
+        first, second = (call[1]['http_client'] for call in mock_cls.call_args_list)
+        assert first is second
+    
+    @pytest.mark.asyncio
+    async def test_run_batch(self, openai_interface, mock_openai_client):
+        """Test batch submission, polling and result parsing"""
+        import json
+        
+        mock_openai_client.files.create = AsyncMock(return_value=Mock(id="file-123"))
+        mock_openai_client.batches.create = AsyncMock(return_value=Mock(id="batch-456"))
+        mock_openai_client.batches.retrieve = AsyncMock(side_effect=[
+            Mock(status="in_progress"),
+            Mock(status="completed", output_file_id="file-out")
+        ])
+        output_lines = [
+            {"custom_id": "1", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "second"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50}}}},
+            {"custom_id": "0", "error": {"message": "failed"}, "response": None}
+        ]
+        mock_openai_client.files.content = AsyncMock(
+            return_value=Mock(text="\n".join(json.dumps(line) for line in output_lines))
+        )
+        
+        with patch('src.ai_models.asyncio.sleep', new=AsyncMock()):
+            results = await openai_interface.run_batch(["first", "second"])
+        
+        # Each JSONL line carries the chat request body
+        uploaded = mock_openai_client.files.create.call_args[1]['file'][1].getvalue().decode().splitlines()
+        assert json.loads(uploaded[1])['body']['messages'][1]['content'] == "second"
+        
+        assert results[0] is None
+        assert results[1]['content'] == "second"
+        # Batch pricing is half of 100 * 0.00001 + 50 * 0.00002
+        assert results[1]['cost'] == pytest.approx(0.001)
+        assert openai_interface.total_cost == pytest.approx(0.001)
 
 
 class TestClaudeInterface:
@@ -250,6 +382,8 @@ class TestClaudeInterface:
         mock_response = Mock()
         mock_response.content = [mock_content]
         mock_response.stop_reason = "end_turn"
+        mock_response.usage.input_tokens = 100
+        mock_response.usage.output_tokens = 50
         
         mock_claude_client.messages.create = AsyncMock(return_value=mock_response)
         
@@ -268,9 +402,9 @@ class TestClaudeInterface:
         assert result['content'] == "Claude response content"
         assert result['model'] == "claude-sonnet-4"
         assert result['stop_reason'] == "end_turn"
-        assert 'cost' in result
-        assert 'input_tokens' in result
-        assert 'output_tokens' in result
+        assert result['cost'] == 0.002  # 100 * 0.00001 + 50 * 0.00002
+        assert result['input_tokens'] == 100
+        assert result['output_tokens'] == 50
     
     @pytest.mark.asyncio
     async def test_generate_completion_with_thinking_budget(self, claude_interface, mock_claude_client):
@@ -280,6 +414,8 @@ class TestClaudeInterface:
         mock_response = Mock()
         mock_response.content = [mock_content]
         mock_response.stop_reason = "end_turn"
+        mock_response.usage.input_tokens = 100
+        mock_response.usage.output_tokens = 50
         
         mock_claude_client.messages.create = AsyncMock(return_value=mock_response)
         
@@ -293,6 +429,31 @@ class TestClaudeInterface:
         call_kwargs = mock_claude_client.messages.create.call_args[1]
         assert call_kwargs['thinking_budget'] == 5000
     
+    @pytest.mark.asyncio
+    async def test_generate_completion_cached_prefix(self, claude_interface, mock_claude_client):
+        """Test static context is sent as a cache_control block ahead of the prompt"""
+        mock_content = Mock()
+        mock_content.text = "Response"
+        mock_response = Mock()
+        mock_response.content = [mock_content]
+        mock_response.stop_reason = "end_turn"
+        mock_response.usage.input_tokens = 100
+        mock_response.usage.output_tokens = 50
+        
+        mock_claude_client.messages.create = AsyncMock(return_value=mock_response)
+        
+        await claude_interface.generate_completion("Question", cached_prefix="Curriculum context")
+        
+        call_kwargs = mock_claude_client.messages.create.call_args[1]
+        assert 'cached_prefix' not in call_kwargs
+        assert call_kwargs['messages'] == [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "Curriculum context", "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": "Question"}
+            ]
+        }]
+    
     @pytest.mark.asyncio
     async def test_generate_completion_opus_no_thinking(self, mock_claude_client):
         """Test that Opus model doesn't use thinking budget"""
@@ -314,6 +475,8 @@ class TestClaudeInterface:
         mock_response = Mock()
         mock_response.content = [mock_content]
         mock_response.stop_reason = "end_turn"
+        mock_response.usage.input_tokens = 100
+        mock_response.usage.output_tokens = 50
         
         mock_claude_client.messages.create = AsyncMock(return_value=mock_response)
         
@@ -327,17 +490,49 @@ class TestClaudeInterface:
         call_kwargs = mock_claude_client.messages.create.call_args[1]
         assert 'thinking_budget' not in call_kwargs
     
+    @pytest.mark.asyncio
+    async def test_generate_completion_stream(self, claude_interface, mock_claude_client):
+        """Test streamed text is yielded and usage is taken from the final message"""
+        final_message = Mock()
+        final_message.content = [Mock(text="Hello world")]
+        final_message.stop_reason = "end_turn"
+        final_message.usage.input_tokens = 100
+        final_message.usage.output_tokens = 50
+        
+        async def text_stream():
+            yield "Hello"
+            yield " world"
+        
+        stream = MagicMock()
+        stream.__aenter__.return_value = stream
+        stream.text_stream = text_stream()
+        stream.get_final_message = AsyncMock(return_value=final_message)
+        mock_claude_client.messages.stream = Mock(return_value=stream)
+        
+        final = {}
+        texts = [text async for text in claude_interface.generate_completion_stream("Test prompt", final=final)]
+        
+        mock_claude_client.messages.stream.assert_called_once_with(
+            model="claude-sonnet-4",
+            messages=[{"role": "user", "content": "Test prompt"}],
+            temperature=0.7,
+            max_tokens=1000
+        )
+        assert texts == ["Hello", " world"]
+        assert final['content'] == "Hello world"
+        assert final['stop_reason'] == "end_turn"
+        assert final['cost'] == 0.002
+    
     @pytest.mark.asyncio
     async def test_generate_completion_error(self, claude_interface, mock_claude_client):
-        """Test error handling in completion generation"""
-        from tenacity import RetryError
-        
+        """Test non-transient errors are raised without retrying"""
         mock_claude_client.messages.create = AsyncMock(
             side_effect=Exception("Claude API Error")
         )
         
-        with pytest.raises(RetryError):
+        with pytest.raises(Exception, match="Claude API Error"):
             await claude_interface.generate_completion("Test prompt")
+        mock_claude_client.messages.create.assert_called_once()
 
 
 class TestGeminiInterface:
@@ -379,6 +574,8 @@ class TestGeminiInterface:
         mock_candidate.finish_reason.name = "STOP"
         mock_response = Mock()
         mock_response.text = "Gemini response content"
+        mock_response.usage_metadata.prompt_token_count = 100
+        mock_response.usage_metadata.candidates_token_count = 50
         mock_response.candidates = [mock_candidate]
         
         mock_gemini_model.generate_content_async = AsyncMock(return_value=mock_response)
@@ -404,6 +601,8 @@ class TestGeminiInterface:
         """Test completion with additional parameters"""
         mock_response = Mock()
         mock_response.text = "Response"
+        mock_response.usage_metadata.prompt_token_count = 100
+        mock_response.usage_metadata.candidates_token_count = 50
         mock_response.candidates = []  # Test empty candidates
         
         mock_gemini_model.generate_content_async = AsyncMock(return_value=mock_response)
@@ -420,15 +619,14 @@ class TestGeminiInterface:
     
     @pytest.mark.asyncio
     async def test_generate_completion_error(self, gemini_interface, mock_gemini_model):
-        """Test error handling in completion generation"""
-        from tenacity import RetryError
-        
+        """Test non-transient errors are raised without retrying"""
         mock_gemini_model.generate_content_async = AsyncMock(
             side_effect=Exception("Gemini API Error")
         )
         
-        with pytest.raises(RetryError):
+        with pytest.raises(Exception, match="Gemini API Error"):
             await gemini_interface.generate_completion("Test prompt")
+        mock_gemini_model.generate_content_async.assert_called_once()
 
 
 class TestAIModelManager:
@@ -439,41 +637,26 @@ class TestAIModelManager:
         """Create mock configuration"""
         config = Mock()
         
-        # Mock models config
-        config.models = {
-            'gemini_pro': Mock(
-                name='gemini-2.5-pro',
-                api_key='test-google-key',
-                temperature=0.7,
-                max_tokens=1000,
-                cost_per_input_token=0.00001,
-                cost_per_output_token=0.00002
-            ),
-            'gpt5': Mock(
-                name='gpt-5',
-                api_key='test-openai-key',
-                temperature=0.7,
-                max_tokens=1000,
-                cost_per_input_token=0.00001,
-                cost_per_output_token=0.00002
-            ),
-            'claude_sonnet': Mock(
-                name='claude-sonnet-4',
-                api_key='test-anthropic-key',
-                temperature=0.7,
-                max_tokens=1000,
-                cost_per_input_token=0.00001,
-                cost_per_output_token=0.00002
-            ),
-            'claude_opus': Mock(
-                name='claude-opus-4.1',
-                api_key='test-anthropic-key',
+        # Mock models config (Mock(name=...) would only name the mock, so set it afterwards)
+        model_names = {
+            'gpt4o': 'gpt-4o',
+            'gpt4_turbo': 'gpt-4-turbo',
+            'gemini_pro': 'gemini-2.5-pro',
+            'gpt5': 'gpt-5',
+            'claude_sonnet': 'claude-sonnet-4',
+            'claude_opus': 'claude-opus-4.1'
+        }
+        config.models = {}
+        for key, model_name in model_names.items():
+            model_config = Mock(
+                api_key='test-key',
                 temperature=0.7,
                 max_tokens=1000,
                 cost_per_input_token=0.00001,
                 cost_per_output_token=0.00002
             )
-        }
+            model_config.name = model_name
+            config.models[key] = model_config
         
         # Mock processing config
         config.processing = Mock(
@@ -516,6 +699,30 @@ class TestAIModelManager:
         assert result['cost'] == 0.001
         assert manager.total_cost == 0.001
     
+    @pytest.mark.asyncio
+    async def test_stream_completion(self, manager):
+        """Test streamed completions add their final cost to the manager total"""
+        async def fake_stream(prompt, final=None, **kwargs):
+            yield "Streamed"
+            final.update({'content': 'Streamed', 'cost': 0.001})
+        
+        manager.models['gpt5'].generate_completion_stream = fake_stream
+        
+        final = {}
+        texts = [text async for text in manager.stream_completion('gpt5', 'Test prompt', final=final)]
+        
+        assert texts == ['Streamed']
+        assert final['content'] == 'Streamed'
+        assert manager.total_cost == 0.001
+    
+    @pytest.mark.asyncio
+    async def test_stream_completion_without_streaming_support(self, manager):
+        """Test providers without streaming deliver the whole completion as one chunk"""
+        texts = [text async for text in manager.stream_completion('gemini_pro', 'Test prompt')]
+        
+        assert texts == ['Response from gemini_pro']
+        assert manager.total_cost == 0.001
+    
     @pytest.mark.asyncio
     async def test_get_completion_unknown_model(self, manager):
         """Test error for unknown model"""
@@ -526,7 +733,7 @@ class TestAIModelManager:
     async def test_cost_alert_threshold(self, manager, mock_config):
         """Test cost alert when threshold is reached"""
         # Test the _check_cost_limits method directly
-        manager.total_cost = 50.0  # At threshold
+        manager.cost_by_model['gpt5'] = 50.0  # At threshold
         
         with patch('src.ai_models.config', mock_config):
             with patch('src.ai_models.logger.warning') as mock_warning:
@@ -538,7 +745,7 @@ class TestAIModelManager:
     async def test_cost_limit_exceeded(self, manager, mock_config):
         """Test error when daily cost limit is exceeded"""
         # Test the _check_cost_limits method directly
-        manager.total_cost = 100.0  # At limit
+        manager.cost_by_model['gpt5'] = 100.0  # At limit
         
         with patch('src.ai_models.config', mock_config):
             with pytest.raises(Exception, match="Daily cost limit exceeded"):
@@ -554,6 +761,7 @@ class TestAIModelManager:
         stats = manager.get_total_usage_stats()
         
         assert stats['total_cost'] == 0.002  # 2 completions at 0.001 each
+        assert manager.cost_by_model == {'gpt5': 0.001, 'claude_sonnet': 0.001}
         assert 'models' in stats
         assert 'gpt5' in stats['models']
         assert 'claude_sonnet' in stats['models']
@@ -0,0 +1,144 @@
+"""
+Unit tests for artifacts.py module
+Tests save/load of intermediate phase artifacts
+"""
+import pytest
+import os
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import src.artifacts as artifacts
+from src.artifacts import save_artifact, load_artifact, load_cached, ZSTD_SUFFIX
+
+
+class TestArtifacts:
+    """Test artifact save/load helpers"""
+
+    @pytest.fixture
+    def sample_data(self):
+        """Sample phase output"""
+        return {
+            'weighted_relations': [
+                {'source': '[2수01-01]', 'target': '[2수01-02]', 'weight': 0.8}
+            ],
+            'metadata': {'total_relations': 1}
+        }
+
+    def test_save_writes_json_and_zst(self, tmp_path, sample_data):
+        """Test that both the readable JSON and the compressed sibling are written"""
+        path = str(tmp_path / "phase2.json")
+        save_artifact(sample_data, path)
+
+        assert os.path.exists(path)
+        assert os.path.exists(path + ZSTD_SUFFIX)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == sample_data
+
+    def test_save_writes_readable_json(self, tmp_path):
+        """Test the plain JSON is indented and keeps Korean text unescaped"""
+        path = str(tmp_path / "phase1.json")
+        save_artifact({'domain': '수와 연산'}, path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == '{\n  "domain": "수와 연산"\n}'
+
+    def test_save_serializes_numpy_and_pandas_values(self, tmp_path):
+        """Test pandas-derived scalars in a phase result do not break the save"""
+        path = str(tmp_path / "phase2.json")
+        save_artifact({
+            'count': np.int64(3),
+            'weight': np.float64(0.5),
+            'weights': np.array([0.25, 0.75]),
+            'created': pd.Timestamp('2024-01-02'),
+            'mean': pd.Series([1, 2]).mean()
+        }, path)
+
+        assert load_artifact(path) == {
+            'count': 3, 'weight': 0.5, 'weights': [0.25, 0.75], 'created': '2024-01-02T00:00:00', 'mean': 1.5
+        }
+
+    def test_round_trip_from_zst(self, tmp_path, sample_data):
+        """Test loading prefers the compressed sibling"""
+        path = str(tmp_path / "phase2.json")
+        save_artifact(sample_data, path)
+        os.remove(path)
+
+        assert load_artifact(path) == sample_data
+
+    def test_fallback_to_plain_json(self, tmp_path, sample_data):
+        """Test loading plain JSON when no .zst sibling exists"""
+        path = str(tmp_path / "phase1.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(sample_data, f, ensure_ascii=False)
+
+        assert load_artifact(path) == sample_data
+
+    def test_stale_zst_ignored(self, tmp_path, sample_data):
+        """Test that a .zst older than the plain JSON is not used"""
+        path = str(tmp_path / "phase3.json")
+        save_artifact({'old': True}, path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(sample_data, f, ensure_ascii=False)
+        os.utime(path + ZSTD_SUFFIX, (0, 0))
+
+        assert load_artifact(path) == sample_data
+
+    def test_missing_artifact_raises(self, tmp_path):
+        """Test FileNotFoundError when neither file exists"""
+        with pytest.raises(FileNotFoundError):
+            load_artifact(str(tmp_path / "missing.json"))
+
+    def test_relation_fields_interned(self, tmp_path):
+        """Test repeated relation field values share one string object"""
+        path = str(tmp_path / "phase2.json")
+        relations = [
+            {'source_code': 'A', 'target_code': 'B', 'relation_type': 'prerequisite', 'weight': 0.5},
+            {'source_code': 'B', 'target_code': 'C', 'relation_type': 'prerequisite', 'mapped_type': None},
+        ]
+        save_artifact({'weighted_relations': relations}, path)
+
+        loaded = load_artifact(path)['weighted_relations']
+        assert loaded[0]['relation_type'] is loaded[1]['relation_type']
+        assert loaded[0]['target_code'] is loaded[1]['source_code']
+        assert loaded[1]['mapped_type'] is None
+
+    def test_load_cached_writes_and_reuses_cache(self, tmp_path, monkeypatch, sample_data):
+        """Test the cache is populated on first load and reused afterwards"""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(artifacts, 'CACHE_DIR', str(cache_dir))
+        path = str(tmp_path / "phase1.json")
+        save_artifact(sample_data, path)
+
+        assert load_cached(path) == sample_data
+        assert len(list(cache_dir.iterdir())) == 1
+
+        with patch('src.artifacts._decode_source') as mock_decode:
+            assert load_cached(path) == sample_data
+            mock_decode.assert_not_called()
+
+    def test_load_cached_misses_on_changed_source(self, tmp_path, monkeypatch, sample_data):
+        """Test a changed source file produces a new cache entry"""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(artifacts, 'CACHE_DIR', str(cache_dir))
+        path = str(tmp_path / "phase1.json")
+        save_artifact(sample_data, path)
+        load_cached(path)
+
+        save_artifact({'changed': True}, path)
+        assert load_cached(path) == {'changed': True}
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_load_cached_skips_shared_cache_dir(self, tmp_path, monkeypatch, sample_data):
+        """Test a cache directory other users can write to is neither read nor written"""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        os.chmod(cache_dir, 0o777)
+        monkeypatch.setattr(artifacts, 'CACHE_DIR', str(cache_dir))
+        path = str(tmp_path / "phase1.json")
+        save_artifact(sample_data, path)
+
+        assert load_cached(path) == sample_data
+        assert list(cache_dir.iterdir()) == []
@@ -13,7 +13,7 @@ import sys
 sys.path.append('../src')
 
 from src.data_manager import DatabaseManager, CurriculumDataProcessor
-from src.ai_models import AIModelManager, OpenAIInterface, ClaudeInterface, GeminiInterface
+from src.ai_models import AIModelManager, CostLimitExceeded, OpenAIInterface, ClaudeInterface, GeminiInterface
 from config.settings import ModelConfig
 
 class TestDataManager:
@@ -160,6 +160,8 @@ class TestAIModels:
             mock_response = Mock()
             mock_response.content = [mock_content]
             mock_response.stop_reason = "end_turn"
+            mock_response.usage.input_tokens = 100
+            mock_response.usage.output_tokens = 50
             
             mock_client = Mock()
             mock_client.messages.create = AsyncMock(return_value=mock_response)
@@ -175,10 +177,131 @@ class TestAIModels:
     async def test_cost_limit_check(self):
         """Test cost limit checking"""
         manager = AIModelManager()
-        manager.total_cost = 250.0  # Exceed limit
+        manager.cost_by_model['gpt5'] = 250.0  # Exceed limit
         
         with pytest.raises(Exception, match="Daily cost limit exceeded"):
             await manager._check_cost_limits()
+    
+    @pytest.mark.asyncio
+    async def test_completions_bulk_bounded_concurrency(self):
+        """Test bulk completions respect the semaphore and keep failures in place"""
+        manager = AIModelManager()
+        in_flight = 0
+        peak = 0
+        
+        async def fake_completion(prompt, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if prompt == 'bad':
+                raise Exception("429 Too Many Requests")
+            return {'content': prompt, 'cost': 0.001}
+        
+        manager.models['gpt5'].generate_completion = fake_completion
+        prompts = ['p0', 'p1', 'bad', 'p3', 'p4', 'p5']
+        results = await manager.get_completions_bulk('gpt5', prompts, concurrency=2)
+        
+        assert peak == 2
+        assert [r['content'] for i, r in enumerate(results) if i != 2] == ['p0', 'p1', 'p3', 'p4', 'p5']
+        assert isinstance(results[2], Exception)
+        assert manager.total_cost == pytest.approx(0.005)
+    
+    @pytest.mark.asyncio
+    async def test_completions_bulk_deduplicates_prompts(self):
+        """Test identical prompts are sent once and the result is broadcast"""
+        manager = AIModelManager()
+        manager.models['gpt5'].generate_completion = AsyncMock(
+            side_effect=lambda prompt, **kwargs: {'content': prompt.upper(), 'cost': 0.001}
+        )
+        
+        results = await manager.get_completions_bulk('gpt5', ['a', 'b', 'a', 'a'])
+        
+        assert manager.models['gpt5'].generate_completion.call_count == 2
+        assert [r['content'] for r in results] == ['A', 'B', 'A', 'A']
+    
+    @pytest.mark.asyncio
+    async def test_completions_bulk_raises_cost_limit(self):
+        """Test hitting the cost limit stops a bulk run instead of becoming a per-prompt failure"""
+        manager = AIModelManager()
+        manager.cost_by_model['gpt5'] = 250.0  # Exceed limit
+        manager.models['gpt5'].generate_completion = AsyncMock()
+        
+        with pytest.raises(CostLimitExceeded):
+            await manager.get_completions_bulk('gpt5', ['a', 'b'])
+        manager.models['gpt5'].generate_completion.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_cost_limit_counts_calls_in_flight(self):
+        """Test concurrent calls reserve their worst-case cost before the limit check"""
+        manager = AIModelManager()
+        model = manager.models['gpt5']
+        model.estimate_cost = Mock(return_value=80.0)
+    
+        async def fake_completion(prompt, **kwargs):
+            await asyncio.sleep(0.01)
+            return {'content': prompt, 'cost': 1.0}
+        
+        model.generate_completion = fake_completion
+        with patch('src.ai_models.config.processing.max_daily_cost', 200.0):
+            with pytest.raises(CostLimitExceeded, match="in flight"):
+                await manager.get_completions_bulk('gpt5', ['a', 'b', 'c'], concurrency=3)
+        
+        # Two calls fit under the limit; the third was refused before it started
+        assert manager.total_cost == pytest.approx(2.0)
+        assert manager.reserved_cost == 0.0
+
+    @pytest.mark.asyncio
+    async def test_temperature_zero_completion_cached(self, tmp_path):
+        """Test temperature-0 completions are served from the response cache"""
+        from src.llm_cache import LLMCache
+        
+        manager = AIModelManager()
+        manager.cache = LLMCache(str(tmp_path / "llm.sqlite"))
+        model = manager.models['gpt4o']
+        model.config = model.config.model_copy(update={'temperature': 0.0})
+        model.generate_completion = AsyncMock(return_value={'content': 'cached answer', 'cost': 0.01})
+        
+        first = await manager.get_completion('gpt4o', 'Test prompt')
+        second = await manager.get_completion('gpt4o', 'Test prompt')
+        
+        model.generate_completion.assert_called_once()
+        assert first['content'] == second['content'] == 'cached answer'
+        assert second['cost'] == 0.0
+        assert manager.total_cost == 0.01
+        assert manager.get_total_usage_stats()['cache'] == {'hits': 1, 'misses': 1}
+        
+        # An explicit max_tokens is part of the key, not passed to make_key twice
+        limited = await manager.get_completion('gpt4o', 'Test prompt', max_tokens=500)
+        assert model.generate_completion.call_count == 2
+        assert model.generate_completion.call_args.kwargs == {'max_tokens': 500}
+        assert await manager.get_completion('gpt4o', 'Test prompt', max_tokens=500) == {**limited, 'cost': 0.0, 'cached': True}
+        assert model.generate_completion.call_count == 2
+        manager.cache.close()
+    
+    @pytest.mark.asyncio
+    async def test_llm_cache_all_replays_sampled_completion_with_max_tokens(self, tmp_path):
+        """Test KG_LLM_CACHE=1 caches sampled calls that pass max_tokens, as phase 2 does"""
+        from src.llm_cache import LLMCache
+        
+        manager = AIModelManager()
+        manager.cache = LLMCache(str(tmp_path / "llm.sqlite"))
+        model = manager.models['gpt4o']
+        model.config = model.config.model_copy(update={'temperature': 0.7})
+        model.generate_completion = AsyncMock(return_value={'content': 'sampled answer', 'cost': 0.02})
+        
+        with patch('src.ai_models.config.processing.llm_cache_all', True):
+            first = await manager.get_completion('gpt4o', 'Test prompt', max_tokens=1000)
+            second = await manager.get_completion('gpt4o', 'Test prompt', max_tokens=1000)
+            # A different limit is a different request
+            await manager.get_completion('gpt4o', 'Test prompt', max_tokens=600)
+        
+        assert model.generate_completion.call_count == 2
+        assert first['content'] == second['content'] == 'sampled answer'
+        assert second['cached'] is True
+        assert manager.get_total_usage_stats()['cache'] == {'hits': 1, 'misses': 2}
+        manager.cache.close()
 
 class TestPhaseIntegration:
     """Integration tests for phase execution"""
@@ -247,6 +370,22 @@ class TestPhaseIntegration:
             assert 'node_structure' in result
             assert 'metadata' in result
     
+    @pytest.mark.asyncio
+    async def test_phase1_fallback_design_is_a_copy(self):
+        """Test editing a fallback design does not change the one later calls get"""
+        from src.phase1_foundation import FoundationDesigner, FALLBACK_NODE_STRUCTURE
+        
+        mock_ai = Mock()
+        mock_ai.get_completion = AsyncMock(return_value={'content': 'not json', 'cost': 0.0})
+        designer = FoundationDesigner(mock_ai)
+        
+        first = await designer._ai_json("node_structure", "prompt", "context", FALLBACK_NODE_STRUCTURE)
+        first['node_types']['achievement_standard']['properties'].append('edited')
+        second = await designer._ai_json("node_structure", "prompt", "context", FALLBACK_NODE_STRUCTURE)
+        
+        assert second == FALLBACK_NODE_STRUCTURE
+        assert 'edited' not in FALLBACK_NODE_STRUCTURE['node_types']['achievement_standard']['properties']
+    
     def test_relationship_extraction_logic(self, sample_relationship_data):
         """Test relationship extraction logic"""
         relations = sample_relationship_data['weighted_relations']
@@ -0,0 +1,66 @@
+"""
+Unit tests for llm_cache.py module
+Tests LLMCache key derivation and SQLite persistence
+"""
+import pytest
+
+from src.llm_cache import LLMCache
+
+
+class TestLLMCache:
+    """Test LLMCache class"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create LLMCache backed by a temporary database"""
+        cache = LLMCache(str(tmp_path / "cache" / "llm.sqlite"))
+        yield cache
+        cache.close()
+    
+    def test_make_key_is_stable(self):
+        """Test key depends only on request parameters, not kwarg order"""
+        key1 = LLMCache.make_key("gpt-4o", "prompt", 0.0, 100, top_p=1, stop=["x"])
+        key2 = LLMCache.make_key("gpt-4o", "prompt", 0.0, 100, stop=["x"], top_p=1)
+        key3 = LLMCache.make_key("gpt-4o", "prompt", 0.0, 200, top_p=1, stop=["x"])
+        
+        assert key1 == key2
+        assert key1 != key3
+    
+    @pytest.mark.asyncio
+    async def test_get_set_round_trip(self, cache):
+        """Test stored responses are returned and counted as hits"""
+        assert await cache.get("k") is None
+        
+        await cache.set("k", {'content': '응답', 'cost': 0.01})
+        
+        assert await cache.get("k") == {'content': '응답', 'cost': 0.01}
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+    
+    @pytest.mark.asyncio
+    async def test_reads_json_text_rows(self, cache):
+        """Test rows stored as JSON text are still readable"""
+        cache._connect().execute(
+            "INSERT INTO responses (key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            ("k", '{"content": "응답", "cost": 0.01}', 0.0, None)
+        )
+        
+        assert await cache.get("k") == {'content': '응답', 'cost': 0.01}
+    
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self, cache):
+        """Test entries past their ttl are ignored"""
+        await cache.set("k", {'content': 'old'}, ttl=-1)
+        
+        assert await cache.get("k") is None
+    
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """Test responses survive reopening the database"""
+        path = str(tmp_path / "llm.sqlite")
+        first = LLMCache(path)
+        await first.set("k", {'content': 'saved'})
+        first.close()
+        
+        second = LLMCache(path)
+        assert await second.get("k") == {'content': 'saved'}
+        second.close()